@@ -7,23 +7,20 @@ from pytgcalls.exceptions import NoActiveGroupCall
 import config
 from SONALI_MUSIC import LOGGER, app, userbot
 from SONALI_MUSIC.core.call import Sona
+from SONALI_MUSIC.core.indexes import ensure_indexes
+from SONALI_MUSIC.core.mongo import close_mongo
+from SONALI_MUSIC.core.startup import Startup
+from SONALI_MUSIC.core.userbot import SESSIONS
 from SONALI_MUSIC.misc import sudo
 from SONALI_MUSIC.plugins import ALL_MODULES
-from SONALI_MUSIC.utils.database import get_banned_users, get_gbanned
+from SONALI_MUSIC.utils.bulk import writer
+from SONALI_MUSIC.utils.chatsettings import flush_settings, migrate_settings
+from SONALI_MUSIC.utils.database import get_banned_users, get_gbanned, load_memberships
+from SONALI_MUSIC.utils.stream.snapshot import snapshot_queues
 from config import BANNED_USERS
 
 
-async def init():
-    if (
-        not config.STRING1
-        and not config.STRING2
-        and not config.STRING3
-        and not config.STRING4
-        and not config.STRING5
-    ):
-        LOGGER(__name__).error("𝐒𝐭𝐫𝐢𝐧𝐠 𝐒𝐞𝐬𝐬𝐢𝐨𝐧 𝐍𝐨𝐭 𝐅𝐢𝐥𝐥𝐞𝐝, 𝐏𝐥𝐞𝐚𝐬𝐞 𝐅𝐢𝐥𝐥 𝐀 𝐏𝐲𝐫𝐨𝐠𝐫𝐚𝐦 𝐒𝐞𝐬𝐬𝐢𝐨𝐧")
-        exit()
-    await sudo()
+async def load_bans():
     try:
         users = await get_gbanned()
         for user_id in users:
@@ -33,12 +30,16 @@ async def init():
             BANNED_USERS.add(user_id)
     except:
         pass
-    await app.start()
+
+
+async def load_plugins():
     for all_module in ALL_MODULES:
         importlib.import_module("SONALI_MUSIC.plugins" + all_module)
+        await asyncio.sleep(0)
     LOGGER("SONALI_MUSIC.plugins").info("𝐀𝐥𝐥 𝐅𝐞𝐚𝐭𝐮𝐫𝐞𝐬 𝐋𝐨𝐚𝐝𝐞𝐝 𝐁𝐚𝐛𝐲🥳...")
-    await userbot.start()
-    await Sona.start()
+
+
+async def probe_call():
     try:
         await Sona.stream_call("https://te.legra.ph/file/29f784eb49d230ab62e9e.mp4")
     except NoActiveGroupCall:
@@ -48,13 +49,43 @@ async def init():
         exit()
     except:
         pass
-    await Sona.decorators()
+
+
+async def init():
+    if not SESSIONS:
+        LOGGER(__name__).error("𝐒𝐭𝐫𝐢𝐧𝐠 𝐒𝐞𝐬𝐬𝐢𝐨𝐧 𝐍𝐨𝐭 𝐅𝐢𝐥𝐥𝐞𝐝, 𝐏𝐥𝐞𝐚𝐬𝐞 𝐅𝐢𝐥𝐥 𝐀 𝐏𝐲𝐫𝐨𝐠𝐫𝐚𝐦 𝐒𝐞𝐬𝐬𝐢𝐨𝐧")
+        exit()
+    startup = Startup()
+    startup.phase("sudo", sudo)
+    startup.phase("memberships", load_memberships)
+    startup.phase("bans", load_bans, after=("memberships",))
+    startup.phase("settings", migrate_settings)
+    startup.phase("indexes", ensure_indexes)
+    # Handlers fire as soon as the bot is up, so sudoers and bans must be loaded.
+    startup.phase("bot", app.start, after=("sudo", "bans"))
+    startup.phase("plugins", load_plugins)
+    startup.phase("assistants", userbot.start)
+    # Call clients share session files with the assistants, so start them after.
+    startup.phase("calls", Sona.start, after=("assistants",))
+    startup.phase("probe", probe_call, after=("calls",))
+    startup.phase("decorators", Sona.decorators, after=("calls",))
+    startup.phase(
+        "restore",
+        Sona.restore_snapshots,
+        after=("bot", "plugins", "decorators", "probe"),
+    )
+    await startup.run()
     LOGGER("SONALI_MUSIC").info(
         "╔═════ஜ۩۞۩ஜ════╗\n  ☠︎︎𝗠𝗔𝗗𝗘 𝗕𝗬 𝗔𝗟𝗣𝗛𝗔☠︎︎\n╚═════ஜ۩۞۩ஜ════╝"
     )
     await idle()
+    # Stop taking updates first so nothing is queued behind the final flush.
     await app.stop()
     await userbot.stop()
+    await snapshot_queues()
+    await flush_settings()
+    await writer.flush()
+    await close_mongo()
     LOGGER("SONALI_MUSIC").info("𝗦𝗧𝗢𝗣 𝗦𝗢𝗡𝗔𝗟𝗜 𝗠𝗨𝗦𝗜𝗖 𝗕𝗢𝗧..")
 
 
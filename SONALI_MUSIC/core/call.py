@@ -1,5 +1,4 @@
 import asyncio
-import os
 from datetime import datetime, timedelta
 from typing import Union
 
@@ -13,15 +12,19 @@ from pytgcalls.exceptions import (
 )
 from pytgcalls.types import Update
 from pytgcalls.types.input_stream import AudioPiped, AudioVideoPiped
-from pytgcalls.types.input_stream.quality import HighQualityAudio, MediumQualityVideo
 from pytgcalls.types.stream import StreamAudioEnded
 
 import config
 from SONALI_MUSIC import LOGGER, YouTube, app
+from SONALI_MUSIC.core.scheduler import scheduler
+from SONALI_MUSIC.core.session import end_session, get_session
+from SONALI_MUSIC.core.userbot import SESSIONS
 from SONALI_MUSIC.misc import db
 from SONALI_MUSIC.utils.database import (
     add_active_chat,
     add_active_video_chat,
+    assistantdict,
+    get_assistant_number,
     get_lang,
     get_loop,
     group_assistant,
@@ -29,85 +32,124 @@ from SONALI_MUSIC.utils.database import (
     music_on,
     remove_active_chat,
     remove_active_video_chat,
+    set_assistant_new,
     set_loop,
 )
 from SONALI_MUSIC.utils.exceptions import AssistantErr
 from SONALI_MUSIC.utils.formatters import check_duration, seconds_to_min, speed_converter
 from SONALI_MUSIC.utils.inline.play import stream_markup
+from SONALI_MUSIC.utils.stream.actor import dispatch
 from SONALI_MUSIC.utils.stream.autoclear import auto_clean
+from SONALI_MUSIC.utils.stream.clock import (
+    get_played,
+    pause_clock,
+    resume_clock,
+    start_clock,
+    stop_clock,
+)
+from SONALI_MUSIC.utils.stream.prefetch import (
+    cancel_prefetch,
+    schedule_prefetch,
+    take_prefetch,
+)
+from SONALI_MUSIC.utils.stream.speed import (
+    add_rendered,
+    get_rendered,
+    live_speed,
+    render_path,
+    tempo_parameters,
+)
+from SONALI_MUSIC.utils.stream.quality import audio_quality, video_quality
+from SONALI_MUSIC.utils.stream.snapshot import (
+    drop_snapshot,
+    load_snapshots,
+    start_snapshots,
+)
+from SONALI_MUSIC.utils.stream.urlcache import urls
 from SONALI_MUSIC.utils.thumbnails import get_thumb
 from strings import get_string
 
-autoend = {}
-counter = {}
-
-
 async def _clear_(chat_id):
-    db[chat_id] = []
-    await remove_active_video_chat(chat_id)
-    await remove_active_chat(chat_id)
+    scheduler.untrack(chat_id)
+    stop_clock(chat_id)
+    cancel_prefetch(chat_id)
+    end_session(chat_id)
 
 
-class Call(PyTgCalls):
-    def __init__(self):
-        self.userbot1 = Client(
-            name="SonaAss1",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING1),
-        )
-        self.one = PyTgCalls(
-            self.userbot1,
-            cache_duration=100,
-        )
-        self.userbot2 = Client(
-            name="SonaAss2",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING2),
-        )
-        self.two = PyTgCalls(
-            self.userbot2,
-            cache_duration=100,
-        )
-        self.userbot3 = Client(
-            name="SonaXAss3",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING3),
-        )
-        self.three = PyTgCalls(
-            self.userbot3,
-            cache_duration=100,
-        )
-        self.userbot4 = Client(
-            name="SonaXAss4",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING4),
+def seekable_stream(file_path, to_seek, duration, mode, speed=1.0):
+    if mode == "video":
+        return AudioVideoPiped(
+            file_path,
+            audio_parameters=audio_quality(),
+            video_parameters=video_quality(),
+            additional_ffmpeg_parameters=f"-ss {to_seek} -to {duration}",
         )
-        self.four = PyTgCalls(
-            self.userbot4,
-            cache_duration=100,
-        )
-        self.userbot5 = Client(
-            name="SonaAss5",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING5),
+    return AudioPiped(
+        file_path,
+        audio_parameters=audio_quality(),
+        additional_ffmpeg_parameters=(
+            f"-ss {to_seek} -to {duration}{tempo_parameters(speed)}"
+        ),
+    )
+
+
+async def current_stream(entry: dict, played: int):
+    video = True if str(entry["streamtype"]) == "video" else False
+    file_path = entry.get("speed_path") or entry["file"]
+    if "live_" in file_path or "vid_" in file_path:
+        n, file_path = await YouTube.video(entry["vidid"], True)
+        if n == 0:
+            raise AssistantErr(file_path)
+    elif "index_" in file_path:
+        file_path = entry["vidid"]
+    if int(entry["seconds"]) and "live_" not in entry["file"]:
+        return seekable_stream(
+            file_path,
+            played,
+            entry["dur"],
+            "video" if video else "audio",
+            live_speed(entry),
         )
-        self.five = PyTgCalls(
-            self.userbot5,
-            cache_duration=100,
+    if video:
+        return AudioVideoPiped(
+            file_path,
+            audio_parameters=audio_quality(),
+            video_parameters=video_quality(),
         )
+    return AudioPiped(file_path, audio_parameters=audio_quality())
+
+
+class Call(PyTgCalls):
+    def __init__(self):
+        self.userbots = {}
+        self.calls = {}
+        for number, session in SESSIONS.items():
+            self.userbots[number] = Client(
+                name=f"SonaAss{number}",
+                api_id=config.API_ID,
+                api_hash=config.API_HASH,
+                session_string=str(session),
+            )
+            self.calls[number] = PyTgCalls(
+                self.userbots[number],
+                cache_duration=100,
+            )
+
+    def started_calls(self):
+        return [
+            self.calls[number]
+            for number in SESSIONS
+        ]
 
     async def pause_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
         await assistant.pause_stream(chat_id)
+        pause_clock(chat_id)
 
     async def resume_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
         await assistant.resume_stream(chat_id)
+        resume_clock(chat_id)
 
     async def stop_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
@@ -118,31 +160,11 @@ class Call(PyTgCalls):
             pass
 
     async def stop_stream_force(self, chat_id: int):
-        try:
-            if config.STRING1:
-                await self.one.leave_group_call(chat_id)
-        except:
-            pass
-        try:
-            if config.STRING2:
-                await self.two.leave_group_call(chat_id)
-        except:
-            pass
-        try:
-            if config.STRING3:
-                await self.three.leave_group_call(chat_id)
-        except:
-            pass
-        try:
-            if config.STRING4:
-                await self.four.leave_group_call(chat_id)
-        except:
-            pass
-        try:
-            if config.STRING5:
-                await self.five.leave_group_call(chat_id)
-        except:
-            pass
+        for call in self.started_calls():
+            try:
+                await call.leave_group_call(chat_id)
+            except:
+                pass
         try:
             await _clear_(chat_id)
         except:
@@ -150,13 +172,26 @@ class Call(PyTgCalls):
 
     async def speedup_stream(self, chat_id: int, file_path, speed, playing):
         assistant = await group_assistant(self, chat_id)
+        if playing[0]["streamtype"] != "video":
+            played = get_played(chat_id)
+            stream = AudioPiped(
+                file_path,
+                audio_parameters=audio_quality(),
+                additional_ffmpeg_parameters=(
+                    f"-ss {played} -to {playing[0]['dur']}{tempo_parameters(speed)}"
+                ),
+            )
+            if str(db[chat_id][0]["file"]) == str(file_path):
+                await assistant.change_stream(chat_id, stream)
+            else:
+                raise AssistantErr("Umm")
+            start_clock(chat_id, played, speed)
+            db[chat_id][0]["speed"] = speed
+            return
         if str(speed) != str("1.0"):
-            base = os.path.basename(file_path)
-            chatdir = os.path.join(os.getcwd(), "playback", str(speed))
-            if not os.path.isdir(chatdir):
-                os.makedirs(chatdir)
-            out = os.path.join(chatdir, base)
-            if not os.path.isfile(out):
+            out = get_rendered(file_path, speed)
+            if not out:
+                out = render_path(file_path, speed)
                 if str(speed) == str("0.5"):
                     vs = 2.0
                 if str(speed) == str("0.75"):
@@ -180,25 +215,24 @@ class Call(PyTgCalls):
                     stderr=asyncio.subprocess.PIPE,
                 )
                 await proc.communicate()
-            else:
-                pass
+                add_rendered(file_path, speed, out)
         else:
             out = file_path
         dur = await asyncio.get_event_loop().run_in_executor(None, check_duration, out)
         dur = int(dur)
-        played, con_seconds = speed_converter(playing[0]["played"], speed)
+        played, con_seconds = speed_converter(get_played(chat_id), speed)
         duration = seconds_to_min(dur)
         stream = (
             AudioVideoPiped(
                 out,
-                audio_parameters=HighQualityAudio(),
-                video_parameters=MediumQualityVideo(),
+                audio_parameters=audio_quality(),
+                video_parameters=video_quality(),
                 additional_ffmpeg_parameters=f"-ss {played} -to {duration}",
             )
             if playing[0]["streamtype"] == "video"
             else AudioPiped(
                 out,
-                audio_parameters=HighQualityAudio(),
+                audio_parameters=audio_quality(),
                 additional_ffmpeg_parameters=f"-ss {played} -to {duration}",
             )
         )
@@ -211,7 +245,7 @@ class Call(PyTgCalls):
             if not exis:
                 db[chat_id][0]["old_dur"] = db[chat_id][0]["dur"]
                 db[chat_id][0]["old_second"] = db[chat_id][0]["seconds"]
-            db[chat_id][0]["played"] = con_seconds
+            start_clock(chat_id, con_seconds)
             db[chat_id][0]["dur"] = duration
             db[chat_id][0]["seconds"] = dur
             db[chat_id][0]["speed_path"] = out
@@ -224,6 +258,9 @@ class Call(PyTgCalls):
             check.pop(0)
         except:
             pass
+        scheduler.untrack(chat_id)
+        stop_clock(chat_id)
+        cancel_prefetch(chat_id)
         await remove_active_video_chat(chat_id)
         await remove_active_chat(chat_id)
         try:
@@ -242,33 +279,131 @@ class Call(PyTgCalls):
         if video:
             stream = AudioVideoPiped(
                 link,
-                audio_parameters=HighQualityAudio(),
-                video_parameters=MediumQualityVideo(),
+                audio_parameters=audio_quality(),
+                video_parameters=video_quality(),
             )
         else:
-            stream = AudioPiped(link, audio_parameters=HighQualityAudio())
+            stream = AudioPiped(link, audio_parameters=audio_quality())
         await assistant.change_stream(
             chat_id,
             stream,
         )
+        start_clock(chat_id)
+        schedule_prefetch(chat_id)
 
-    async def seek_stream(self, chat_id, file_path, to_seek, duration, mode):
+    async def seek_stream(self, chat_id, file_path, to_seek, duration, mode, speed=1.0):
         assistant = await group_assistant(self, chat_id)
-        stream = (
-            AudioVideoPiped(
-                file_path,
-                audio_parameters=HighQualityAudio(),
-                video_parameters=MediumQualityVideo(),
-                additional_ffmpeg_parameters=f"-ss {to_seek} -to {duration}",
+        stream = seekable_stream(file_path, to_seek, duration, mode, speed)
+        await assistant.change_stream(chat_id, stream)
+
+    async def assistant_alive(self, number: int) -> bool:
+        client = self.userbots.get(int(number))
+        if not client or not client.is_connected:
+            return False
+        try:
+            await asyncio.wait_for(client.get_me(), timeout=10)
+        except:
+            return False
+        return True
+
+    async def failover(self, chat_id: int):
+        from SONALI_MUSIC.core.userbot import assistants
+
+        playing = db.get(chat_id)
+        old = await get_assistant_number(chat_id)
+        new = scheduler.pick(assistants, exclude=old)
+        if not playing or new == old or not scheduler.is_healthy(new):
+            return await self.stop_stream(chat_id)
+        entry = playing[0]
+        video = True if str(entry["streamtype"]) == "video" else False
+        speed = live_speed(entry)
+        played = get_played(chat_id)
+        try:
+            stream = await current_stream(entry, played)
+            await self.calls[new].join_group_call(
+                chat_id,
+                stream,
+                stream_type=StreamType().pulse_stream,
             )
-            if mode == "video"
-            else AudioPiped(
-                file_path,
-                audio_parameters=HighQualityAudio(),
-                additional_ffmpeg_parameters=f"-ss {to_seek} -to {duration}",
+        except AlreadyJoinedError:
+            pass
+        except Exception as e:
+            LOGGER(__name__).warning(
+                f"Failover of {chat_id} from assistant {old} to {new} failed: {e}"
             )
+            return await self.stop_stream_force(chat_id)
+        assistantdict[chat_id] = new
+        await set_assistant_new(chat_id, new)
+        scheduler.track(new, chat_id, video=video)
+        start_clock(chat_id, played, speed)
+        try:
+            await self.calls[int(old)].leave_group_call(chat_id)
+        except:
+            pass
+        LOGGER(__name__).info(
+            f"Moved {chat_id} from assistant {old} to {new} at {played}s."
         )
+
+    async def restream(self, chat_id: int):
+        playing = db.get(chat_id)
+        if not playing:
+            return
+        assistant = await group_assistant(self, chat_id)
+        played = get_played(chat_id)
+        stream = await current_stream(playing[0], played)
         await assistant.change_stream(chat_id, stream)
+        start_clock(chat_id, played, live_speed(playing[0]))
+
+    async def rejoin(self, chat_id: int):
+        playing = db.get(chat_id)
+        entry = playing[0]
+        video = True if str(entry["streamtype"]) == "video" else False
+        played = int(entry.get("played", 0))
+        assistant = await group_assistant(self, chat_id)
+        try:
+            stream = await current_stream(entry, played)
+            await assistant.join_group_call(
+                chat_id,
+                stream,
+                stream_type=StreamType().pulse_stream,
+            )
+        except AlreadyJoinedError:
+            pass
+        except Exception as e:
+            LOGGER(__name__).warning(f"Could not rejoin {chat_id}: {e}")
+            await _clear_(chat_id)
+            return await drop_snapshot(chat_id)
+        await add_active_chat(chat_id)
+        await music_on(chat_id)
+        if video:
+            await add_active_video_chat(chat_id)
+        scheduler.track(await get_assistant_number(chat_id), chat_id, video=video)
+        start_clock(chat_id, played, live_speed(entry))
+        schedule_prefetch(chat_id)
+
+    async def restore_snapshots(self):
+        try:
+            restored = await load_snapshots()
+        except Exception as e:
+            restored = []
+            LOGGER(__name__).warning(f"Could not load queue snapshots: {e}")
+        await asyncio.gather(
+            *[dispatch(chat_id, self.rejoin, chat_id) for chat_id in restored],
+            return_exceptions=True,
+        )
+        if restored:
+            LOGGER(__name__).info(f"Restored the queues of {len(restored)} chats.")
+        start_snapshots()
+
+    async def recover_assistant(self, number: int):
+        scheduler.mark_unhealthy(number)
+        await asyncio.gather(
+            *[
+                dispatch(chat_id, self.failover, chat_id)
+                for chat_id in scheduler.carried_by(number)
+            ],
+            return_exceptions=True,
+        )
 
     async def stream_call(self, link):
         assistant = await group_assistant(self, config.LOGGER_ID)
@@ -294,18 +429,18 @@ class Call(PyTgCalls):
         if video:
             stream = AudioVideoPiped(
                 link,
-                audio_parameters=HighQualityAudio(),
-                video_parameters=MediumQualityVideo(),
+                audio_parameters=audio_quality(),
+                video_parameters=video_quality(),
             )
         else:
             stream = (
                 AudioVideoPiped(
                     link,
-                    audio_parameters=HighQualityAudio(),
-                    video_parameters=MediumQualityVideo(),
+                    audio_parameters=audio_quality(),
+                    video_parameters=video_quality(),
                 )
                 if video
-                else AudioPiped(link, audio_parameters=HighQualityAudio())
+                else AudioPiped(link, audio_parameters=audio_quality())
             )
         try:
             await assistant.join_group_call(
@@ -321,13 +456,16 @@ class Call(PyTgCalls):
             raise AssistantErr(_["call_10"])
         await add_active_chat(chat_id)
         await music_on(chat_id)
+        start_clock(chat_id)
         if video:
             await add_active_video_chat(chat_id)
+        scheduler.track(await get_assistant_number(chat_id), chat_id, video=bool(video))
         if await is_autoend():
-            counter[chat_id] = {}
+            session = get_session(chat_id)
+            session.counter = {}
             users = len(await assistant.get_participants(chat_id))
             if users == 1:
-                autoend[chat_id] = datetime.now() + timedelta(minutes=1)
+                session.autoend = datetime.now() + timedelta(minutes=1)
 
     async def change_stream(self, client, chat_id):
         check = db.get(chat_id)
@@ -358,40 +496,47 @@ class Call(PyTgCalls):
             original_chat_id = check[0]["chat_id"]
             streamtype = check[0]["streamtype"]
             videoid = check[0]["vidid"]
-            db[chat_id][0]["played"] = 0
             exis = (check[0]).get("old_dur")
             if exis:
                 db[chat_id][0]["dur"] = exis
                 db[chat_id][0]["seconds"] = check[0]["old_second"]
                 db[chat_id][0]["speed_path"] = None
-                db[chat_id][0]["speed"] = 1.0
+            db[chat_id][0]["speed"] = 1.0
             video = True if str(streamtype) == "video" else False
+            scheduler.track(await get_assistant_number(chat_id), chat_id, video=video)
+            resolved = await take_prefetch(chat_id, check[0]) or {}
             if "live_" in queued:
-                n, link = await YouTube.video(videoid, True)
-                if n == 0:
-                    return await app.send_message(
-                        original_chat_id,
-                        text=_["call_6"],
-                    )
+                if resolved.get("link"):
+                    link = resolved["link"]
+                else:
+                    n, link = await YouTube.video(videoid, True)
+                    if n == 0:
+                        return await app.send_message(
+                            original_chat_id,
+                            text=_["call_6"],
+                        )
                 if video:
                     stream = AudioVideoPiped(
                         link,
-                        audio_parameters=HighQualityAudio(),
-                        video_parameters=MediumQualityVideo(),
+                        audio_parameters=audio_quality(),
+                        video_parameters=video_quality(),
                     )
                 else:
                     stream = AudioPiped(
                         link,
-                        audio_parameters=HighQualityAudio(),
+                        audio_parameters=audio_quality(),
                     )
                 try:
                     await client.change_stream(chat_id, stream)
-                except Exception:
+                except Exception as e:
+                    urls.discard(link, e)
                     return await app.send_message(
                         original_chat_id,
                         text=_["call_6"],
                     )
-                img = await get_thumb(videoid)
+                start_clock(chat_id)
+                schedule_prefetch(chat_id)
+                img = resolved.get("thumb") or await get_thumb(videoid)
                 button = stream_markup(_, chat_id)
                 run = await app.send_photo(
                     chat_id=original_chat_id,
@@ -407,39 +552,47 @@ class Call(PyTgCalls):
                 db[chat_id][0]["mystic"] = run
                 db[chat_id][0]["markup"] = "tg"
             elif "vid_" in queued:
-                mystic = await app.send_message(original_chat_id, _["call_7"])
-                try:
-                    file_path, direct = await YouTube.download(
-                        videoid,
-                        mystic,
-                        videoid=True,
-                        video=True if str(streamtype) == "video" else False,
-                    )
-                except:
-                    return await mystic.edit_text(
-                        _["call_6"], disable_web_page_preview=True
-                    )
+                mystic = None
+                if resolved.get("link"):
+                    file_path = resolved["link"]
+                else:
+                    mystic = await app.send_message(original_chat_id, _["call_7"])
+                    try:
+                        file_path, direct = await YouTube.download(
+                            videoid,
+                            mystic,
+                            videoid=True,
+                            video=True if str(streamtype) == "video" else False,
+                        )
+                    except:
+                        return await mystic.edit_text(
+                            _["call_6"], disable_web_page_preview=True
+                        )
                 if video:
                     stream = AudioVideoPiped(
                         file_path,
-                        audio_parameters=HighQualityAudio(),
-                        video_parameters=MediumQualityVideo(),
+                        audio_parameters=audio_quality(),
+                        video_parameters=video_quality(),
                     )
                 else:
                     stream = AudioPiped(
                         file_path,
-                        audio_parameters=HighQualityAudio(),
+                        audio_parameters=audio_quality(),
                     )
                 try:
                     await client.change_stream(chat_id, stream)
-                except:
+                except Exception as e:
+                    urls.discard(file_path, e)
                     return await app.send_message(
                         original_chat_id,
                         text=_["call_6"],
                     )
-                img = await get_thumb(videoid)
+                start_clock(chat_id)
+                schedule_prefetch(chat_id)
+                img = resolved.get("thumb") or await get_thumb(videoid)
                 button = stream_markup(_, chat_id)
-                await mystic.delete()
+                if mystic:
+                    await mystic.delete()
                 run = await app.send_photo(
                     chat_id=original_chat_id,
                     photo=img,
@@ -457,11 +610,11 @@ class Call(PyTgCalls):
                 stream = (
                     AudioVideoPiped(
                         videoid,
-                        audio_parameters=HighQualityAudio(),
-                        video_parameters=MediumQualityVideo(),
+                        audio_parameters=audio_quality(),
+                        video_parameters=video_quality(),
                     )
                     if str(streamtype) == "video"
-                    else AudioPiped(videoid, audio_parameters=HighQualityAudio())
+                    else AudioPiped(videoid, audio_parameters=audio_quality())
                 )
                 try:
                     await client.change_stream(chat_id, stream)
@@ -470,6 +623,8 @@ class Call(PyTgCalls):
                         original_chat_id,
                         text=_["call_6"],
                     )
+                start_clock(chat_id)
+                schedule_prefetch(chat_id)
                 button = stream_markup(_, chat_id)
                 run = await app.send_photo(
                     chat_id=original_chat_id,
@@ -483,13 +638,13 @@ class Call(PyTgCalls):
                 if video:
                     stream = AudioVideoPiped(
                         queued,
-                        audio_parameters=HighQualityAudio(),
-                        video_parameters=MediumQualityVideo(),
+                        audio_parameters=audio_quality(),
+                        video_parameters=video_quality(),
                     )
                 else:
                     stream = AudioPiped(
                         queued,
-                        audio_parameters=HighQualityAudio(),
+                        audio_parameters=audio_quality(),
                     )
                 try:
                     await client.change_stream(chat_id, stream)
@@ -498,6 +653,8 @@ class Call(PyTgCalls):
                         original_chat_id,
                         text=_["call_6"],
                     )
+                start_clock(chat_id)
+                schedule_prefetch(chat_id)
                 if videoid == "telegram":
                     button = stream_markup(_, chat_id)
                     run = await app.send_photo(
@@ -525,7 +682,7 @@ class Call(PyTgCalls):
                     db[chat_id][0]["mystic"] = run
                     db[chat_id][0]["markup"] = "tg"
                 else:
-                    img = await get_thumb(videoid)
+                    img = resolved.get("thumb") or await get_thumb(videoid)
                     button = stream_markup(_, chat_id)
                     run = await app.send_photo(
                         chat_id=original_chat_id,
@@ -543,59 +700,57 @@ class Call(PyTgCalls):
 
     async def ping(self):
         pings = []
-        if config.STRING1:
-            pings.append(await self.one.ping)
-        if config.STRING2:
-            pings.append(await self.two.ping)
-        if config.STRING3:
-            pings.append(await self.three.ping)
-        if config.STRING4:
-            pings.append(await self.four.ping)
-        if config.STRING5:
-            pings.append(await self.five.ping)
+        for call in self.started_calls():
+            pings.append(await call.ping)
         return str(round(sum(pings) / len(pings), 3))
 
     async def start(self):
         LOGGER(__name__).info("Starting PyTgCalls Client...\n")
-        if config.STRING1:
-            await self.one.start()
-        if config.STRING2:
-            await self.two.start()
-        if config.STRING3:
-            await self.three.start()
-        if config.STRING4:
-            await self.four.start()
-        if config.STRING5:
-            await self.five.start()
+        numbers = list(SESSIONS)
+        await asyncio.gather(*[self.calls[number].start() for number in numbers])
+        for number in numbers:
+            scheduler.register(number, call=self.calls[number])
+
+    async def is_current(self, client, chat_id: int) -> bool:
+        number = await get_assistant_number(chat_id)
+        return not number or self.calls.get(int(number)) is client
 
     async def decorators(self):
-        @self.one.on_kicked()
-        @self.two.on_kicked()
-        @self.three.on_kicked()
-        @self.four.on_kicked()
-        @self.five.on_kicked()
-        @self.one.on_closed_voice_chat()
-        @self.two.on_closed_voice_chat()
-        @self.three.on_closed_voice_chat()
-        @self.four.on_closed_voice_chat()
-        @self.five.on_closed_voice_chat()
-        @self.one.on_left()
-        @self.two.on_left()
-        @self.three.on_left()
-        @self.four.on_left()
-        @self.five.on_left()
-        async def stream_services_handler(_, chat_id: int):
+        # Events are checked inside the actor: an assistant replaced by
+        # failover still reports leaving, and must not stop the new stream.
+        async def services(client, chat_id: int):
+            if not await self.is_current(client, chat_id):
+                return
+            number = await get_assistant_number(chat_id)
+            if number and db.get(chat_id) and not await self.assistant_alive(number):
+                scheduler.mark_unhealthy(number)
+                return await self.failover(chat_id)
             await self.stop_stream(chat_id)
 
-        @self.one.on_stream_end()
-        @self.two.on_stream_end()
-        @self.three.on_stream_end()
-        @self.four.on_stream_end()
-        @self.five.on_stream_end()
+        async def closed(client, chat_id: int):
+            if await self.is_current(client, chat_id):
+                await self.stop_stream(chat_id)
+
+        async def ended(client, chat_id: int):
+            if await self.is_current(client, chat_id):
+                await self.change_stream(client, chat_id)
+
+        async def stream_services_handler(_, chat_id: int):
+            await dispatch(chat_id, services, _, chat_id)
+
+        async def closed_voice_chat_handler(_, chat_id: int):
+            await dispatch(chat_id, closed, _, chat_id)
+
         async def stream_end_handler1(client, update: Update):
             if not isinstance(update, StreamAudioEnded):
                 return
-            await self.change_stream(client, update.chat_id)
+            await dispatch(update.chat_id, ended, client, update.chat_id)
+
+        for call in self.started_calls():
+            call.on_kicked()(stream_services_handler)
+            call.on_closed_voice_chat()(closed_voice_chat_handler)
+            call.on_left()(stream_services_handler)
+            call.on_stream_end()(stream_end_handler1)
 
 
 Sona = Call()
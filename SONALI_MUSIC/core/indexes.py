@@ -0,0 +1,59 @@
+import asyncio
+
+from pymongo import ASCENDING
+
+from SONALI_MUSIC.core.mongo import mongo_client, mongodb
+from SONALI_MUSIC.utils.mongo import db
+
+from ..logging import LOGGER
+
+INDEXES = {
+    mongodb: {
+        "adminauth": ["chat_id"],
+        "assistants": ["chat_id"],
+        "authuser": ["chat_id"],
+        "autoend": ["chat_id"],
+        "blacklistChat": ["chat_id"],
+        "blockedusers": ["user_id"],
+        "chats": ["chat_id"],
+        "chatsettings": ["chat_id"],
+        "cplaymode": ["chat_id"],
+        "gban": ["user_id"],
+        "language": ["chat_id"],
+        "onoffper": ["on_off"],
+        "playmode": ["chat_id"],
+        "playtypedb": ["chat_id"],
+        "queues": ["chat_id"],
+        "skipmode": ["chat_id"],
+        "sudoers": ["sudo"],
+        "tgusersdb": ["user_id"],
+        "upcount": ["chat_id"],
+    },
+    db: {
+        "afk": ["user_id"],
+        "couple": ["chat_id"],
+        "filters.filters": ["chat_id"],
+        "nightmode": ["chat_id"],
+        "notes.notes": ["chat_id"],
+    },
+    mongo_client().Rankings: {
+        "nightmode": ["chat_id"],
+    },
+}
+
+
+async def ensure_indexes():
+    jobs = []
+    for database, collections in INDEXES.items():
+        for collection, fields in collections.items():
+            for field in fields:
+                jobs.append(
+                    database[collection].create_index(
+                        [(field, ASCENDING)], name=f"{field}_1", background=True
+                    )
+                )
+    results = await asyncio.gather(*jobs, return_exceptions=True)
+    failed = [result for result in results if isinstance(result, Exception)]
+    for error in failed:
+        LOGGER(__name__).warning(f"Could not create index: {error}")
+    LOGGER(__name__).info(f"Checked {len(jobs) - len(failed)} database indexes.")
@@ -0,0 +1,534 @@
+import asyncio
+import copy
+import os
+import pickle
+
+from bson import ObjectId
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+from pymongo.errors import DuplicateKeyError
+from pymongo.results import (
+    BulkWriteResult,
+    DeleteResult,
+    InsertManyResult,
+    InsertOneResult,
+    UpdateResult,
+)
+
+from ..logging import LOGGER
+
+SAVE_INTERVAL = 60
+MISSING = object()
+
+
+def _resolve(doc, path: str) -> list:
+    found = [doc]
+    for part in path.split("."):
+        deeper = []
+        for item in found:
+            if isinstance(item, dict):
+                if part in item:
+                    deeper.append(item[part])
+            elif isinstance(item, list):
+                if part.isdigit() and int(part) < len(item):
+                    deeper.append(item[int(part)])
+                else:
+                    deeper.extend(
+                        element[part]
+                        for element in item
+                        if isinstance(element, dict) and part in element
+                    )
+        found = deeper
+    return found
+
+
+def _compare(value, op: str, target) -> bool:
+    try:
+        if op == "$eq":
+            return value == target or (isinstance(value, list) and target in value)
+        if op == "$gt":
+            return value is not MISSING and value > target
+        if op == "$gte":
+            return value is not MISSING and value >= target
+        if op == "$lt":
+            return value is not MISSING and value < target
+        if op == "$lte":
+            return value is not MISSING and value <= target
+        if op == "$in":
+            return any(_compare(value, "$eq", item) for item in target)
+    except TypeError:
+        return False
+    raise ValueError(f"Unsupported query operator {op}")
+
+
+def _is_operator(cond) -> bool:
+    return isinstance(cond, dict) and bool(cond) and all(
+        key.startswith("$") for key in cond
+    )
+
+
+def _matches(doc: dict, spec: dict) -> bool:
+    for key, cond in (spec or {}).items():
+        if key == "$or":
+            if not any(_matches(doc, sub) for sub in cond):
+                return False
+            continue
+        if key == "$and":
+            if not all(_matches(doc, sub) for sub in cond):
+                return False
+            continue
+        values = _resolve(doc, key)
+        candidates = values or [None if not _is_operator(cond) else MISSING]
+        if not _is_operator(cond):
+            if not any(_compare(value, "$eq", cond) for value in candidates):
+                return False
+            continue
+        for op, target in cond.items():
+            if op == "$exists":
+                if bool(values) != bool(target):
+                    return False
+            elif op == "$ne":
+                if any(_compare(value, "$eq", target) for value in values):
+                    return False
+            elif op == "$nin":
+                if any(_compare(value, "$in", target) for value in values):
+                    return False
+            elif not any(_compare(value, op, target) for value in candidates):
+                return False
+    return True
+
+
+def _position(doc: dict, spec: dict, path: str):
+    array = _resolve(doc, path)
+    if not array or not isinstance(array[0], list):
+        return None
+    prefix = path + "."
+    for key, cond in spec.items():
+        if key.startswith(prefix):
+            inner = {key[len(prefix):]: cond}
+            for index, element in enumerate(array[0]):
+                if isinstance(element, dict) and _matches(element, inner):
+                    return index
+    return None
+
+
+def _walk(doc: dict, path: str, spec: dict, create: bool = True):
+    parts = path.split(".")
+    for index, part in enumerate(parts):
+        if part == "$":
+            parts[index] = str(_position(doc, spec, ".".join(parts[:index])))
+    parent = doc
+    for part in parts[:-1]:
+        if isinstance(parent, list):
+            parent = parent[int(part)]
+            continue
+        if part not in parent:
+            if not create:
+                return None, None
+            parent[part] = {}
+        parent = parent[part]
+    return parent, parts[-1]
+
+
+def _set(doc: dict, path: str, value, spec: dict):
+    parent, key = _walk(doc, path, spec)
+    if isinstance(parent, list):
+        parent[int(key)] = value
+    else:
+        parent[key] = value
+
+
+def _get(doc: dict, path: str, default=None):
+    values = _resolve(doc, path)
+    return values[0] if values else default
+
+
+def _apply(doc: dict, update: dict, spec: dict, inserting: bool = False) -> dict:
+    if not any(key.startswith("$") for key in update):
+        replaced = copy.deepcopy(update)
+        replaced["_id"] = doc["_id"]
+        return replaced
+    for op, fields in update.items():
+        for path, value in fields.items():
+            value = copy.deepcopy(value)
+            if op == "$set":
+                _set(doc, path, value, spec)
+            elif op == "$setOnInsert":
+                if inserting:
+                    _set(doc, path, value, spec)
+            elif op == "$unset":
+                parent, key = _walk(doc, path, spec, create=False)
+                if isinstance(parent, dict):
+                    parent.pop(key, None)
+            elif op == "$inc":
+                _set(doc, path, _get(doc, path, 0) + value, spec)
+            elif op in ("$push", "$addToSet"):
+                items = value["$each"] if _is_operator(value) else [value]
+                array = _get(doc, path)
+                if array is None:
+                    array = []
+                    _set(doc, path, array, spec)
+                for item in items:
+                    if op == "$push" or item not in array:
+                        array.append(item)
+            elif op == "$pull":
+                array = _get(doc, path)
+                if isinstance(array, list):
+                    array[:] = [
+                        item
+                        for item in array
+                        if not (
+                            _matches(item, value)
+                            if isinstance(value, dict) and isinstance(item, dict)
+                            else _compare(item, "$eq", value)
+                        )
+                    ]
+            else:
+                raise ValueError(f"Unsupported update operator {op}")
+    return doc
+
+
+def _project(doc: dict, projection) -> dict:
+    if not projection:
+        return copy.deepcopy(doc)
+    if isinstance(projection, (list, tuple)):
+        projection = {field: 1 for field in projection}
+    included = {key for key, keep in projection.items() if keep and key != "_id"}
+    if included:
+        projected = {key: copy.deepcopy(doc[key]) for key in included if key in doc}
+        if projection.get("_id", 1) and "_id" in doc:
+            projected["_id"] = doc["_id"]
+        return projected
+    return {
+        key: copy.deepcopy(value)
+        for key, value in doc.items()
+        if projection.get(key, 1)
+    }
+
+
+class LocalCursor:
+    def __init__(self, collection, spec, projection=None, sort=None, limit=0, skip=0):
+        self.collection = collection
+        self.spec = spec or {}
+        self.projection = projection
+        self.ordering = []
+        self.count = limit or 0
+        self.offset = skip or 0
+        if sort:
+            self.sort(sort)
+
+    def sort(self, key_or_list, direction=1):
+        if isinstance(key_or_list, str):
+            key_or_list = [(key_or_list, direction)]
+        self.ordering.extend(key_or_list)
+        return self
+
+    def limit(self, count: int):
+        self.count = count
+        return self
+
+    def skip(self, offset: int):
+        self.offset = offset
+        return self
+
+    def batch_size(self, size: int):
+        return self
+
+    def _documents(self) -> list:
+        docs = [doc for doc in self.collection.docs.values() if _matches(doc, self.spec)]
+        for key, direction in reversed(self.ordering):
+            docs.sort(
+                key=lambda doc: (_get(doc, key) is None, _get(doc, key)),
+                reverse=direction < 0,
+            )
+        docs = docs[self.offset :]
+        if self.count:
+            docs = docs[: self.count]
+        return [_project(doc, self.projection) for doc in docs]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self._documents():
+            yield doc
+
+    async def to_list(self, length=None):
+        docs = self._documents()
+        return docs[:length] if length else docs
+
+    async def explain(self):
+        return {
+            "queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}},
+            "executionStats": {"totalDocsExamined": len(self.collection.docs)},
+        }
+
+
+class LocalCollection:
+    """Process-local stand-in for the subset of a Motor collection the bot uses."""
+
+    def __init__(self, database, name: str):
+        self.database = database
+        self.name = name
+        self.full_name = f"{database.name}.{name}"
+        self.docs = {}
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.database[f"{self.name}.{name}"]
+
+    def __getitem__(self, name):
+        return self.database[f"{self.name}.{name}"]
+
+    def _first(self, spec: dict):
+        for doc in self.docs.values():
+            if _matches(doc, spec):
+                return doc
+        return None
+
+    def _insert(self, doc: dict):
+        doc = copy.deepcopy(doc)
+        doc.setdefault("_id", ObjectId())
+        if doc["_id"] in self.docs:
+            raise DuplicateKeyError(f"duplicate key {doc['_id']!r} in {self.full_name}")
+        self.docs[doc["_id"]] = doc
+        self.database.client.touch()
+        return doc["_id"]
+
+    def _update(self, spec: dict, update: dict, upsert: bool = False, multi: bool = False):
+        matched = modified = 0
+        for doc in list(self.docs.values()):
+            if not _matches(doc, spec):
+                continue
+            matched += 1
+            before = copy.deepcopy(doc)
+            after = _apply(doc, update, spec)
+            if after != before:
+                self.docs[doc["_id"]] = after
+                modified += 1
+            if not multi:
+                break
+        upserted = None
+        if not matched and upsert:
+            doc = {}
+            for key, cond in spec.items():
+                if not key.startswith("$") and not _is_operator(cond):
+                    _set(doc, key, copy.deepcopy(cond), spec)
+            doc.setdefault("_id", ObjectId())
+            upserted = self._insert(_apply(doc, update, spec, inserting=True))
+        if modified:
+            self.database.client.touch()
+        return matched, modified, upserted
+
+    def _delete(self, spec: dict, multi: bool = False) -> int:
+        deleted = 0
+        for doc in list(self.docs.values()):
+            if _matches(doc, spec):
+                del self.docs[doc["_id"]]
+                deleted += 1
+                if not multi:
+                    break
+        if deleted:
+            self.database.client.touch()
+        return deleted
+
+    def find(self, filter=None, projection=None, **kwargs):
+        kwargs.pop("batch_size", None)
+        return LocalCursor(self, filter, projection, **kwargs)
+
+    async def find_one(self, filter=None, projection=None, **kwargs):
+        if filter is not None and not isinstance(filter, dict):
+            filter = {"_id": filter}
+        doc = self._first(filter or {})
+        return _project(doc, projection) if doc is not None else None
+
+    async def insert_one(self, document: dict, *args, **kwargs):
+        return InsertOneResult(self._insert(document), True)
+
+    async def insert_many(self, documents, *args, **kwargs):
+        return InsertManyResult([self._insert(doc) for doc in documents], True)
+
+    async def update_one(self, filter: dict, update: dict, upsert: bool = False, *args, **kwargs):
+        matched, modified, upserted = self._update(filter, update, upsert)
+        return UpdateResult({"n": matched, "nModified": modified, "upserted": upserted}, True)
+
+    async def update_many(self, filter: dict, update: dict, upsert: bool = False, *args, **kwargs):
+        matched, modified, upserted = self._update(filter, update, upsert, multi=True)
+        return UpdateResult({"n": matched, "nModified": modified, "upserted": upserted}, True)
+
+    async def replace_one(self, filter: dict, replacement: dict, upsert: bool = False, *args, **kwargs):
+        return await self.update_one(filter, replacement, upsert)
+
+    async def delete_one(self, filter: dict, *args, **kwargs):
+        return DeleteResult({"n": self._delete(filter)}, True)
+
+    async def delete_many(self, filter: dict, *args, **kwargs):
+        return DeleteResult({"n": self._delete(filter, multi=True)}, True)
+
+    async def count_documents(self, filter: dict, *args, **kwargs) -> int:
+        return sum(1 for doc in self.docs.values() if _matches(doc, filter))
+
+    async def estimated_document_count(self, *args, **kwargs) -> int:
+        return len(self.docs)
+
+    async def bulk_write(self, requests, ordered: bool = True, *args, **kwargs):
+        result = {
+            "nInserted": 0,
+            "nUpserted": 0,
+            "nMatched": 0,
+            "nModified": 0,
+            "nRemoved": 0,
+            "upserted": [],
+        }
+        for index, request in enumerate(requests):
+            if isinstance(request, InsertOne):
+                self._insert(request._doc)
+                result["nInserted"] += 1
+            elif isinstance(request, (UpdateOne, UpdateMany, ReplaceOne)):
+                matched, modified, upserted = self._update(
+                    request._filter,
+                    request._doc,
+                    request._upsert,
+                    multi=isinstance(request, UpdateMany),
+                )
+                result["nMatched"] += matched
+                result["nModified"] += modified
+                if upserted is not None:
+                    result["nUpserted"] += 1
+                    result["upserted"].append({"index": index, "_id": upserted})
+            elif isinstance(request, (DeleteOne, DeleteMany)):
+                result["nRemoved"] += self._delete(
+                    request._filter, multi=isinstance(request, DeleteMany)
+                )
+        return BulkWriteResult(result, True)
+
+    async def create_index(self, keys, name: str = None, **kwargs) -> str:
+        if isinstance(keys, str):
+            keys = [(keys, 1)]
+        return name or "_".join(f"{field}_{direction}" for field, direction in keys)
+
+    async def drop(self):
+        self.docs.clear()
+        self.database.client.touch()
+
+
+class LocalDatabase:
+    def __init__(self, client, name: str):
+        self.client = client
+        self.name = name
+        self.collections = {}
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, name):
+        collection = self.collections.get(name)
+        if collection is None:
+            collection = self.collections[name] = LocalCollection(self, name)
+        return collection
+
+    async def list_collection_names(self) -> list:
+        return [name for name, collection in self.collections.items() if collection.docs]
+
+    async def command(self, command, *args, **kwargs) -> dict:
+        name = command if isinstance(command, str) else next(iter(command))
+        if name == "ping":
+            return {"ok": 1.0}
+        if name != "dbstats":
+            raise ValueError(f"Unsupported command {name}")
+        collections = [collection for collection in self.collections.values() if collection.docs]
+        size = sum(
+            len(pickle.dumps(collection.docs)) for collection in collections
+        )
+        return {
+            "db": self.name,
+            "collections": len(collections),
+            "objects": sum(len(collection.docs) for collection in collections),
+            "dataSize": size,
+            "storageSize": size,
+            "ok": 1.0,
+        }
+
+
+class LocalClient:
+    """Embedded backend used when no MongoDB server is configured.
+
+    Everything lives in this process. With a path the data is pickled to
+    that file every SAVE_INTERVAL seconds after a write and on shutdown.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.databases = {}
+        self.dirty = False
+        self.task = None
+        if path and os.path.exists(path):
+            self.load()
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, name):
+        database = self.databases.get(name)
+        if database is None:
+            database = self.databases[name] = LocalDatabase(self, name)
+        return database
+
+    def load(self):
+        with open(self.path, "rb") as file:
+            stored = pickle.load(file)
+        for database, collections in stored.items():
+            for collection, docs in collections.items():
+                self[database][collection].docs = docs
+        LOGGER(__name__).info(f"Loaded local database from {self.path}.")
+
+    def touch(self):
+        self.dirty = True
+        if not self.path:
+            return
+        try:
+            if self.task is None or self.task.done():
+                self.task = asyncio.create_task(self.autosave())
+        except RuntimeError:
+            pass
+
+    async def autosave(self):
+        while self.dirty:
+            await asyncio.sleep(SAVE_INTERVAL)
+            await self.save()
+
+    async def save(self):
+        if not self.path or not self.dirty:
+            return
+        self.dirty = False
+        data = pickle.dumps(
+            {
+                name: {
+                    collection: dict(items.docs)
+                    for collection, items in database.collections.items()
+                    if items.docs
+                }
+                for name, database in self.databases.items()
+            }
+        )
+        try:
+            await asyncio.to_thread(self._write, data)
+        except Exception as e:
+            self.dirty = True
+            LOGGER(__name__).warning(f"Could not save local database: {e}")
+
+    def _write(self, data: bytes):
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        temp = f"{self.path}.tmp"
+        with open(temp, "wb") as file:
+            file.write(data)
+        os.replace(temp, self.path)
+
+    def close(self):
+        pass
@@ -1,15 +1,173 @@
 
+import threading
+import time
+from collections import deque
+
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
 
+import config
 from config import MONGO_DB_URI
 
 from ..logging import LOGGER
+from .localdb import LocalClient
+
+SLOW_QUERY_MS = 50
+READ_COMMANDS = {"find", "count", "countDocuments", "aggregate", "distinct"}
+WRITE_COMMANDS = {"update", "delete", "findAndModify"}
+
+
+class SlowQueryLog(monitoring.CommandListener):
+    """Remembers database commands that took longer than SLOW_QUERY_MS."""
+
+    def __init__(self):
+        self.inflight = {}
+        self.slow = deque(maxlen=100)
+
+    def _query(self, event):
+        command = event.command
+        name = event.command_name
+        if name in READ_COMMANDS:
+            return command.get(name), command.get("filter") or command.get("query")
+        if name in WRITE_COMMANDS:
+            statements = command.get("updates") or command.get("deletes") or [command]
+            return command.get(name), statements[0].get("q") or statements[0].get("query")
+        return None
+
+    def started(self, event):
+        query = self._query(event)
+        if query:
+            self.inflight[event.request_id] = (event.database_name, event.command_name, query)
+
+    def succeeded(self, event):
+        query = self.inflight.pop(event.request_id, None)
+        if query and event.duration_micros >= SLOW_QUERY_MS * 1000:
+            database, name, (collection, spec) = query
+            self.slow.append(
+                {
+                    "database": database,
+                    "collection": collection,
+                    "command": name,
+                    "filter": spec or {},
+                    "ms": round(event.duration_micros / 1000, 1),
+                }
+            )
+
+    def failed(self, event):
+        self.inflight.pop(event.request_id, None)
+
+
+class PoolLatency(monitoring.ConnectionPoolListener):
+    """Measures how long the driver waits to check a connection out."""
+
+    def __init__(self):
+        self.waiting = {}
+        self.latencies = deque(maxlen=500)
+        self.failed = 0
+
+    def connection_check_out_started(self, event):
+        self.waiting[(event.address, threading.get_ident())] = time.monotonic()
+
+    def connection_checked_out(self, event):
+        started = self.waiting.pop((event.address, threading.get_ident()), None)
+        if started is not None:
+            self.latencies.append(time.monotonic() - started)
+
+    def connection_check_out_failed(self, event):
+        self.waiting.pop((event.address, threading.get_ident()), None)
+        self.failed += 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+    def stats(self) -> dict:
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return {"p50": 0.0, "p95": 0.0, "max": 0.0, "failed": self.failed}
+        return {
+            "p50": round(ordered[len(ordered) // 2] * 1000, 2),
+            "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2),
+            "max": round(ordered[-1] * 1000, 2),
+            "failed": self.failed,
+        }
+
+
+slowlog = SlowQueryLog()
+poollog = PoolLatency()
+_mongo_async_ = None
+
+
+def _local_path(uri: str):
+    if uri and uri.startswith("memory://"):
+        return uri[len("memory://") :] or None
+    return None
+
+
+def mongo_client() -> AsyncIOMotorClient:
+    """The one Motor client, and so one pool, shared by every database.
+
+    With MONGO_DB_URI set to "memory" an in-process LocalClient is used
+    instead; "memory://path" also persists it to that file.
+    """
+    global _mongo_async_
+    if _mongo_async_ is None:
+        if MONGO_DB_URI and MONGO_DB_URI.startswith("memory"):
+            _mongo_async_ = LocalClient(_local_path(MONGO_DB_URI))
+            return _mongo_async_
+        _mongo_async_ = AsyncIOMotorClient(
+            MONGO_DB_URI,
+            maxPoolSize=config.MONGO_POOL_SIZE,
+            compressors=config.MONGO_COMPRESSORS,
+            connectTimeoutMS=config.MONGO_TIMEOUT,
+            serverSelectionTimeoutMS=config.MONGO_TIMEOUT,
+            socketTimeoutMS=config.MONGO_TIMEOUT * 3,
+            readPreference=config.MONGO_READ_PREFERENCE,
+            event_listeners=[slowlog, poollog],
+        )
+    return _mongo_async_
+
+
+async def close_mongo():
+    if isinstance(_mongo_async_, LocalClient):
+        await _mongo_async_.save()
+
 
 LOGGER(__name__).info("Connecting to your Mongo Database...")
 try:
-    _mongo_async_ = AsyncIOMotorClient(MONGO_DB_URI)
-    mongodb = _mongo_async_.Anon
-    LOGGER(__name__).info("Connected to your Mongo Database.")
+    mongodb = mongo_client().Anon
+    if isinstance(_mongo_async_, LocalClient):
+        if _local_path(MONGO_DB_URI):
+            LOGGER(__name__).info(
+                f"Using the local in-process database, saved to {_local_path(MONGO_DB_URI)}."
+            )
+        else:
+            LOGGER(__name__).warning(
+                "Using the local in-process database without a file. Sudoers, bans, "
+                "served chats and settings will be lost on every restart."
+            )
+    else:
+        LOGGER(__name__).info("Connected to your Mongo Database.")
 except:
     LOGGER(__name__).error("Failed to connect to your Mongo Database.")
     exit()
@@ -0,0 +1,97 @@
+import random
+
+from ..logging import LOGGER
+
+AUDIO_WEIGHT = 1
+VIDEO_WEIGHT = 3
+
+
+class AssistantScheduler:
+    """Registry of assistant clients and the calls each one is carrying."""
+
+    def __init__(self):
+        self.clients = {}
+        self.calls = {}
+        self.audio = {}
+        self.video = {}
+        self.unhealthy = set()
+
+    def register(self, number: int, client=None, call=None):
+        number = int(number)
+        if client is not None:
+            self.clients[number] = client
+        if call is not None:
+            self.calls[number] = call
+        self.audio.setdefault(number, set())
+        self.video.setdefault(number, set())
+
+    def get_client(self, number: int):
+        return self.clients.get(int(number))
+
+    def get_call(self, number: int):
+        return self.calls.get(int(number))
+
+    def load(self, number: int) -> int:
+        number = int(number)
+        return (
+            len(self.audio.get(number, ())) * AUDIO_WEIGHT
+            + len(self.video.get(number, ())) * VIDEO_WEIGHT
+        )
+
+    def is_healthy(self, number: int) -> bool:
+        return int(number) not in self.unhealthy
+
+    def healthy(self, assistants: list) -> list:
+        return [num for num in assistants if self.is_healthy(num)]
+
+    def pick(self, assistants: list, exclude: int = None) -> int:
+        candidates = [num for num in self.healthy(assistants) if num != exclude]
+        if not candidates:
+            candidates = [num for num in assistants if num != exclude] or assistants
+        lowest = min(self.load(num) for num in candidates)
+        return random.choice(
+            [num for num in candidates if self.load(num) == lowest]
+        )
+
+    def track(self, number: int, chat_id: int, video: bool = False):
+        self.untrack(chat_id)
+        number = int(number)
+        self.register(number)
+        if video:
+            self.video[number].add(chat_id)
+        else:
+            self.audio[number].add(chat_id)
+
+    def untrack(self, chat_id: int):
+        for chats in self.audio.values():
+            chats.discard(chat_id)
+        for chats in self.video.values():
+            chats.discard(chat_id)
+
+    def carried_by(self, number: int) -> list:
+        number = int(number)
+        return list(self.audio.get(number, ())) + list(self.video.get(number, ()))
+
+    def mark_unhealthy(self, number: int):
+        if int(number) not in self.unhealthy:
+            self.unhealthy.add(int(number))
+            LOGGER(__name__).warning(f"Assistant {number} marked unhealthy.")
+
+    def mark_healthy(self, number: int):
+        if int(number) in self.unhealthy:
+            self.unhealthy.discard(int(number))
+            LOGGER(__name__).info(f"Assistant {number} is healthy again.")
+
+    def stats(self) -> dict:
+        return {
+            num: {
+                "audio": len(self.audio.get(num, ())),
+                "video": len(self.video.get(num, ())),
+                "load": self.load(num),
+                "healthy": self.is_healthy(num),
+            }
+            for num in sorted(set(self.clients) | set(self.calls))
+        }
+
+
+scheduler = AssistantScheduler()
@@ -0,0 +1,133 @@
+from collections.abc import MutableMapping
+
+
+class ChatSession:
+    """Runtime playback and permission state of one chat."""
+
+    __slots__ = (
+        "chat_id",
+        "queue",
+        "active",
+        "video",
+        "playing",
+        "loop",
+        "autoend",
+        "counter",
+        "admins",
+        "confirmer",
+        "votes",
+        "invite",
+        "timers",
+        "checker",
+        "speeding",
+        "reloaded",
+    )
+
+    def __init__(self, chat_id: int):
+        self.chat_id = chat_id
+        self.admins = None
+        self.invite = None
+        self.reloaded = None
+        self.reset()
+
+    def reset(self):
+        self.queue = None
+        self.active = False
+        self.video = False
+        self.playing = False
+        self.loop = 0
+        self.autoend = None
+        self.counter = None
+        self.confirmer = None
+        self.votes = None
+        self.timers = None
+        self.checker = None
+        self.speeding = False
+
+    def idle(self) -> bool:
+        return (
+            not self.active
+            and not self.queue
+            and self.admins is None
+            and self.invite is None
+            and self.reloaded is None
+        )
+
+
+sessions = {}
+
+
+def get_session(chat_id: int) -> ChatSession:
+    session = sessions.get(chat_id)
+    if session is None:
+        session = sessions[chat_id] = ChatSession(chat_id)
+    return session
+
+
+def find_session(chat_id: int):
+    return sessions.get(chat_id)
+
+
+def end_session(chat_id: int):
+    session = sessions.get(chat_id)
+    if session is None:
+        return
+    session.reset()
+    session.queue = []
+    if session.idle():
+        sessions.pop(chat_id, None)
+
+
+def active_chats(video: bool = False) -> list:
+    if video:
+        return [chat_id for chat_id, session in sessions.items() if session.video]
+    return [chat_id for chat_id, session in sessions.items() if session.active]
+
+
+class SessionView(MutableMapping):
+    """A chat_id -> value mapping over one attribute of the sessions.
+
+    None means the chat has no value, so old dict-style call sites keep
+    working while the session owns the state.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __getitem__(self, chat_id):
+        session = sessions.get(chat_id)
+        value = None if session is None else getattr(session, self.name)
+        if value is None:
+            raise KeyError(chat_id)
+        return value
+
+    def __setitem__(self, chat_id, value):
+        setattr(get_session(chat_id), self.name, value)
+
+    def __delitem__(self, chat_id):
+        self[chat_id]
+        setattr(sessions[chat_id], self.name, None)
+
+    def __contains__(self, chat_id):
+        session = sessions.get(chat_id)
+        return session is not None and getattr(session, self.name) is not None
+
+    def __iter__(self):
+        return iter(
+            [
+                chat_id
+                for chat_id, session in sessions.items()
+                if getattr(session, self.name) is not None
+            ]
+        )
+
+    def __len__(self):
+        return sum(
+            1 for session in sessions.values() if getattr(session, self.name) is not None
+        )
+
+
+adminlist = SessionView("admins")
+confirmer = SessionView("confirmer")
+votemode = SessionView("votes")
+links = SessionView("invite")
@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+from ..logging import LOGGER
+
+
+class Startup:
+    """Runs boot phases concurrently, each one once its dependencies are done."""
+
+    def __init__(self):
+        self.phases = {}
+        self.timings = {}
+
+    def phase(self, name: str, func, after: tuple = ()):
+        self.phases[name] = (func, tuple(after))
+
+    def check(self):
+        done = set()
+        pending = dict(self.phases)
+        while pending:
+            ready = [
+                name
+                for name, (_, after) in pending.items()
+                if all(dep in done for dep in after)
+            ]
+            if not ready:
+                missing = {
+                    dep
+                    for _, after in pending.values()
+                    for dep in after
+                    if dep not in self.phases
+                }
+                if missing:
+                    raise ValueError(f"Unknown startup phases: {', '.join(missing)}")
+                raise ValueError(f"Startup phases depend on each other: {', '.join(pending)}")
+            for name in ready:
+                done.add(name)
+                pending.pop(name)
+
+    async def run_phase(self, name: str, tasks: dict):
+        func, after = self.phases[name]
+        if after:
+            await asyncio.gather(*[tasks[dep] for dep in after])
+        started = time.monotonic()
+        await func()
+        self.timings[name] = time.monotonic() - started
+        LOGGER(__name__).info(f"Startup phase {name} took {self.timings[name]:.2f}s.")
+
+    async def run(self):
+        self.check()
+        started = time.monotonic()
+        tasks = {}
+        for name in self.phases:
+            tasks[name] = asyncio.create_task(self.run_phase(name, tasks))
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        LOGGER(__name__).info(
+            f"Started in {time.monotonic() - started:.2f}s ("
+            + ", ".join(f"{name} {took:.2f}s" for name, took in self.timings.items())
+            + ")."
+        )
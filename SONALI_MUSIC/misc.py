@@ -6,6 +6,7 @@ from pyrogram import filters
 
 import config
 from SONALI_MUSIC.core.mongo import mongodb
+from SONALI_MUSIC.core.session import SessionView
 
 from .logging import LOGGER
 
@@ -38,7 +39,7 @@ XCB = [
 
 def dbb():
     global db
-    db = {}
+    db = SessionView("queue")
     LOGGER(__name__).info(f"𝗗𝗔𝗧𝗔𝗕𝗔𝗦𝗘 𝗟𝗢𝗔𝗗𝗘𝗗 𝗕𝗢𝗦𝗦")
 
 
@@ -1,8 +1,13 @@
+from pymongo import DeleteOne, UpdateOne
+
+from SONALI_MUSIC.utils.bulk import writer
+from SONALI_MUSIC.utils.cache import cached
 from SONALI_MUSIC.utils.mongo import db
 
 afkdb = db.afk
 
 
+@cached(ttl=60)
 async def is_afk(user_id: int) -> bool:
     user = await afkdb.find_one({"user_id": user_id})
     if not user:
@@ -11,22 +16,25 @@ async def is_afk(user_id: int) -> bool:
 
 
 async def add_afk(user_id: int, mode):
-    await afkdb.update_one(
-        {"user_id": user_id}, {"$set": {"reason": mode}}, upsert=True
+    writer.put(
+        afkdb,
+        UpdateOne({"user_id": user_id}, {"$set": {"reason": mode}}, upsert=True),
     )
+    is_afk.set((True, mode), user_id)
 
 
 async def remove_afk(user_id: int):
-    user = await afkdb.find_one({"user_id": user_id})
-    if user:
-        return await afkdb.delete_one({"user_id": user_id})
+    writer.put(afkdb, DeleteOne({"user_id": user_id}))
+    is_afk.set((False, {}), user_id)
 
 
 async def get_afk_users() -> list:
-    users = afkdb.find({"user_id": {"$gt": 0}})
-    if not users:
-        return []
     users_list = []
-    for user in await users.to_list(length=1000000000):
+    async for user in iter_afk_users():
         users_list.append(user)
     return users_list
+
+
+async def iter_afk_users(batch_size: int = 1000):
+    async for user in afkdb.find({"user_id": {"$gt": 0}}, batch_size=batch_size):
+        yield user
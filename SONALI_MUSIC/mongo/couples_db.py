@@ -1,7 +1,9 @@
+from SONALI_MUSIC.utils.cache import cached
 from SONALI_MUSIC.utils.mongo import db
 
 coupledb = db.couple
 
+@cached()
 async def _get_lovers(cid: int):
     lovers = await coupledb.find_one({"chat_id": cid})
     if lovers:
@@ -10,6 +12,7 @@ async def _get_lovers(cid: int):
         lovers = {}
     return lovers
 
+@cached()
 async def _get_image(cid: int):
     lovers = await coupledb.find_one({"chat_id": cid})
     if lovers:
@@ -34,3 +37,5 @@ async def save_couple(cid: int, date: str, couple: dict, img: str):
         {"$set": {"couple": lovers, "img": img}},
         upsert=True,
                               )
+    _get_lovers.invalidate(cid)
+    _get_image.invalidate(cid)
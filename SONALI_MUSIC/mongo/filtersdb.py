@@ -1,7 +1,12 @@
+from SONALI_MUSIC.utils.cache import cached
 from SONALI_MUSIC.utils.mongo import db
 
 filters = db.filters["filters"] 
 
+def _invalidate(chat_id):
+   get_filter.invalidate(chat_id)
+   get_filters_list.invalidate(chat_id)
+
 async def add_filter_db(chat_id: int, filter_name: str, content: str, text: str, data_type: int):
    filter_data = await filters.find_one(
       {
@@ -60,6 +65,7 @@ async def add_filter_db(chat_id: int, filter_name: str, content: str, text: str,
                   }
                }
             )
+   _invalidate(chat_id)
 
 async def stop_db(chat_id: int, filter_name:str):
    await filters.update_one(
@@ -74,6 +80,7 @@ async def stop_db(chat_id: int, filter_name:str):
          }
       }
    )
+   _invalidate(chat_id)
 
 async def stop_all_db(chat_id: id):
    await filters.update_one(
@@ -87,7 +94,9 @@ async def stop_all_db(chat_id: id):
       },
       upsert=True
    )
-   
+   _invalidate(chat_id)
+
+@cached()
 async def get_filter(chat_id: int, filter_name: str):
    filter_data = await filters.find_one(
       {
@@ -108,6 +117,7 @@ async def get_filter(chat_id: int, filter_name: str):
                data_type
             )
 
+@cached()
 async def get_filters_list(chat_id: int):
    filter_data = await filters.find_one(
       {
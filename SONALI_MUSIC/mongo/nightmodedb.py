@@ -1,9 +1,8 @@
 from typing import Dict, List, Union
-from config import MONGO_DB_URI
-from motor.motor_asyncio import AsyncIOMotorClient as MongoCli
+from SONALI_MUSIC.core.mongo import mongo_client
 
 
-mongo = MongoCli(MONGO_DB_URI).Rankings
+mongo = mongo_client().Rankings
 
 nightdb = mongo.nightmode
 
@@ -1,3 +1,4 @@
+from SONALI_MUSIC.utils.cache import cached
 from SONALI_MUSIC.utils.mongo import db
 
 #from SONALI_MUSIC.mongo import *# back...............
@@ -5,6 +6,11 @@ from SONALI_MUSIC.utils.mongo import db
 notes = db.notes["notes"]
 
 
+def _invalidate(chat_id):
+    for cache in (GetNote, isNoteExist, NoteList, is_pnote_on):
+        cache.invalidate(chat_id)
+
+
 async def SaveNote(chat_id, note_name, content, text, data_type):
     GetNotes = await notes.find_one(
         {
@@ -99,6 +105,10 @@ async def SaveNote(chat_id, note_name, content, text, data_type):
                     }
                 }
             )
+    _invalidate(chat_id)
+
+
+@cached()
 async def GetNote(chat_id, note_name):
     GetNoteData = await notes.find_one(
         {
@@ -122,6 +132,7 @@ async def GetNote(chat_id, note_name):
     else:
         return None 
 
+@cached()
 async def isNoteExist(chat_id, note_name) -> bool:
     GetNoteData = await notes.find_one(
         {
@@ -143,6 +154,7 @@ async def isNoteExist(chat_id, note_name) -> bool:
             return False
     return False
 
+@cached()
 async def NoteList(chat_id) -> list:
     NotesNamesList = []
     GetNoteData = await notes.find_one(
@@ -179,7 +191,9 @@ async def ClearNote(chat_id, note_name):
             }
         }
     )
+    _invalidate(chat_id)
 
+@cached()
 async def is_pnote_on(chat_id) -> bool:
     GetNoteData = await notes.find_one(
         {
@@ -206,6 +220,7 @@ async def ClearAllNotes(chat_id):
             }
         }
     )
+    _invalidate(chat_id)
 
 async def set_private_note(chat_id, private_note):
     await notes.update_one(
@@ -219,3 +234,4 @@ async def set_private_note(chat_id, private_note):
         },
         upsert=True
                               )
+    _invalidate(chat_id)
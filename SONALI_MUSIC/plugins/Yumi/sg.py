@@ -24,8 +24,7 @@ async def sg(client: Client, message: Message):
             return await lol.edit("<code>Please specify a valid user!</code>")
     bo = ["sangmata_bot", "sangmata_beta_bot"]
     sg = random.choice(bo)
-    if 1 in assistants:
-        ubot = us.one
+    ubot = us.clients[assistants[0]]
     
     try:
         a = await ubot.send_message(sg, f"{user.id}")
@@ -2,6 +2,7 @@ from pyrogram import filters
 from pyrogram.types import Message
 
 from SONALI_MUSIC import app
+from SONALI_MUSIC.core.session import adminlist
 from SONALI_MUSIC.utils import extract_user, int_to_alpha
 from SONALI_MUSIC.utils.database import (
     delete_authuser,
@@ -11,7 +12,7 @@ from SONALI_MUSIC.utils.database import (
 )
 from SONALI_MUSIC.utils.decorators import AdminActual, language
 from SONALI_MUSIC.utils.inline import close_markup
-from config import BANNED_USERS, adminlist
+from config import BANNED_USERS
 
 
 
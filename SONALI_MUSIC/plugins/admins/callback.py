@@ -1,10 +1,10 @@
-import asyncio
 from telegram import CallbackQuery
 from pyrogram import filters
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from SONALI_MUSIC import YouTube, app
 from SONALI_MUSIC.core.call import Sona
+from SONALI_MUSIC.core.session import SessionView, adminlist, confirmer, votemode
 from SONALI_MUSIC.misc import SUDOERS, db
 from SONALI_MUSIC.utils.database import (
     get_active_chats,
@@ -25,9 +25,13 @@ from pyrogram.errors import (
 )
 from SONALI_MUSIC.utils.database import get_assistant
 from SONALI_MUSIC.utils.decorators.language import languageCB
+from SONALI_MUSIC.utils.edit_scheduler import editor
 from SONALI_MUSIC.utils.formatters import seconds_to_min
 from SONALI_MUSIC.utils.inline import close_markup, stream_markup, stream_markup_timer
+from SONALI_MUSIC.utils.stream.actor import dispatch
 from SONALI_MUSIC.utils.stream.autoclear import auto_clean
+from SONALI_MUSIC.utils.stream.clock import get_played
+from SONALI_MUSIC.utils.stream.prefetch import schedule_prefetch
 from SONALI_MUSIC.utils.thumbnails import get_thumb
 from config import (
     BANNED_USERS,
@@ -35,13 +39,10 @@ from config import (
     STREAM_IMG_URL,
     TELEGRAM_AUDIO_URL,
     TELEGRAM_VIDEO_URL,
-    adminlist,
-    confirmer,
-    votemode,
 )
 from strings import get_string
 
-checker = {}
+checker = SessionView("checker")
 upvoters = {}
 
 
@@ -150,6 +151,10 @@ async def del_back_playlist(client, CallbackQuery, _):
                         return await CallbackQuery.answer(
                             _["admin_14"], show_alert=True
                         )
+    await dispatch(chat_id, admin_action, CallbackQuery, _, command, chat_id, mention)
+
+
+async def admin_action(CallbackQuery, _, command, chat_id, mention):
     if command == "Pause":
         if not await is_music_playing(chat_id):
             return await CallbackQuery.answer(_["admin_1"], show_alert=True)
@@ -185,6 +190,7 @@ async def del_back_playlist(client, CallbackQuery, _):
                 popped = check.pop(0)
                 if popped:
                     await auto_clean(popped)
+                schedule_prefetch(chat_id)
                 if not check:
                     await CallbackQuery.edit_message_text(
                         f"➻ sᴛʀᴇᴀᴍ sᴋɪᴩᴩᴇᴅ 🎄\n│ \n└ʙʏ : {mention} 🥀"
@@ -223,13 +229,12 @@ async def del_back_playlist(client, CallbackQuery, _):
         streamtype = check[0]["streamtype"]
         videoid = check[0]["vidid"]
         status = True if str(streamtype) == "video" else None
-        db[chat_id][0]["played"] = 0
         exis = (check[0]).get("old_dur")
         if exis:
             db[chat_id][0]["dur"] = exis
             db[chat_id][0]["seconds"] = check[0]["old_second"]
             db[chat_id][0]["speed_path"] = None
-            db[chat_id][0]["speed"] = 1.0
+        db[chat_id][0]["speed"] = 1.0
         if "live_" in queued:
             n, link = await YouTube.video(videoid, True)
             if n == 0:
@@ -370,47 +375,44 @@ async def del_back_playlist(client, CallbackQuery, _):
 
 
 async def markup_timer():
-    while not await asyncio.sleep(7):
-        active_chats = await get_active_chats()
-        for chat_id in active_chats:
+    active_chats = await get_active_chats()
+    for chat_id in active_chats:
+        try:
+            if not await is_music_playing(chat_id):
+                continue
+            playing = db.get(chat_id)
+            if not playing:
+                continue
+            duration_seconds = int(playing[0]["seconds"])
+            if duration_seconds == 0:
+                continue
             try:
-                if not await is_music_playing(chat_id):
-                    continue
-                playing = db.get(chat_id)
-                if not playing:
-                    continue
-                duration_seconds = int(playing[0]["seconds"])
-                if duration_seconds == 0:
-                    continue
-                try:
-                    mystic = playing[0]["mystic"]
-                except:
-                    continue
-                try:
-                    check = checker[chat_id][mystic.id]
-                    if check is False:
-                        continue
-                except:
-                    pass
-                try:
-                    language = await get_lang(chat_id)
-                    _ = get_string(language)
-                except:
-                    _ = get_string("en")
-                try:
-                    buttons = stream_markup_timer(
-                        _,
-                        chat_id,
-                        seconds_to_min(playing[0]["played"]),
-                        playing[0]["dur"],
-                    )
-                    await mystic.edit_reply_markup(
-                        reply_markup=InlineKeyboardMarkup(buttons)
-                    )
-                except:
+                mystic = playing[0]["mystic"]
+            except:
+                continue
+            try:
+                check = checker[chat_id][mystic.id]
+                if check is False:
                     continue
+            except:
+                pass
+            try:
+                language = await get_lang(chat_id)
+                _ = get_string(language)
+            except:
+                _ = get_string("en")
+            try:
+                buttons = stream_markup_timer(
+                    _,
+                    chat_id,
+                    seconds_to_min(get_played(chat_id)),
+                    playing[0]["dur"],
+                )
+                editor.submit(mystic, InlineKeyboardMarkup(buttons))
             except:
                 continue
+        except:
+            continue
 
 
-asyncio.create_task(markup_timer())
+editor.add_source(markup_timer)
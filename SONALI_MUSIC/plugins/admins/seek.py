@@ -6,6 +6,10 @@ from SONALI_MUSIC.core.call import Sona
 from SONALI_MUSIC.misc import db
 from SONALI_MUSIC.utils import AdminRightsCheck, seconds_to_min
 from SONALI_MUSIC.utils.inline import close_markup
+from SONALI_MUSIC.utils.stream.actor import dispatch
+from SONALI_MUSIC.utils.stream.clock import get_played, start_clock
+from SONALI_MUSIC.utils.stream.speed import live_speed
+from SONALI_MUSIC.utils.stream.urlcache import urls
 from config import BANNED_USERS
 
 
@@ -16,6 +20,10 @@ from config import BANNED_USERS
 )
 @AdminRightsCheck
 async def seek_comm(cli, message: Message, _, chat_id):
+    await dispatch(chat_id, seek_track, cli, message, _, chat_id)
+
+
+async def seek_track(cli, message: Message, _, chat_id):
     if len(message.command) == 1:
         return await message.reply_text(_["admin_20"])
     query = message.text.split(None, 1)[1].strip()
@@ -28,7 +36,7 @@ async def seek_comm(cli, message: Message, _, chat_id):
     if duration_seconds == 0:
         return await message.reply_text(_["admin_22"])
     file_path = playing[0]["file"]
-    duration_played = int(playing[0]["played"])
+    duration_played = get_played(chat_id)
     duration_to_skip = int(query)
     duration = playing[0]["dur"]
     if message.command[0][-2] == "c":
@@ -62,13 +70,15 @@ async def seek_comm(cli, message: Message, _, chat_id):
             seconds_to_min(to_seek),
             duration,
             playing[0]["streamtype"],
+            live_speed(playing[0]),
         )
-    except:
+    except Exception as e:
+        urls.discard(file_path, e)
         return await mystic.edit_text(_["admin_26"], reply_markup=close_markup(_))
     if message.command[0][-2] == "c":
-        db[chat_id][0]["played"] -= duration_to_skip
+        start_clock(chat_id, duration_played - duration_to_skip, live_speed(playing[0]))
     else:
-        db[chat_id][0]["played"] += duration_to_skip
+        start_clock(chat_id, duration_played + duration_to_skip, live_speed(playing[0]))
     await mystic.edit_text(
         text=_["admin_25"].format(seconds_to_min(to_seek), message.from_user.mention),
         reply_markup=close_markup(_),
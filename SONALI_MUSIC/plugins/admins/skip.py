@@ -8,7 +8,9 @@ from SONALI_MUSIC.misc import db
 from SONALI_MUSIC.utils.database import get_loop
 from SONALI_MUSIC.utils.decorators import AdminRightsCheck
 from SONALI_MUSIC.utils.inline import close_markup, stream_markup
+from SONALI_MUSIC.utils.stream.actor import dispatch
 from SONALI_MUSIC.utils.stream.autoclear import auto_clean
+from SONALI_MUSIC.utils.stream.prefetch import schedule_prefetch
 from SONALI_MUSIC.utils.thumbnails import get_thumb
 from config import BANNED_USERS
 
@@ -18,6 +20,10 @@ from config import BANNED_USERS
 )
 @AdminRightsCheck
 async def skip(cli, message: Message, _, chat_id):
+    await dispatch(chat_id, skip_track, cli, message, _, chat_id)
+
+
+async def skip_track(cli, message: Message, _, chat_id):
     if not len(message.command) < 2:
         loop = await get_loop(chat_id)
         if loop != 0:
@@ -52,6 +58,7 @@ async def skip(cli, message: Message, _, chat_id):
                                 except:
                                     return
                                 break
+                        schedule_prefetch(chat_id)
                     else:
                         return await message.reply_text(_["admin_11"].format(count))
                 else:
@@ -67,6 +74,7 @@ async def skip(cli, message: Message, _, chat_id):
             popped = check.pop(0)
             if popped:
                 await auto_clean(popped)
+            schedule_prefetch(chat_id)
             if not check:
                 await message.reply_text(
                     text=_["admin_6"].format(
@@ -95,13 +103,12 @@ async def skip(cli, message: Message, _, chat_id):
     streamtype = check[0]["streamtype"]
     videoid = check[0]["vidid"]
     status = True if str(streamtype) == "video" else None
-    db[chat_id][0]["played"] = 0
     exis = (check[0]).get("old_dur")
     if exis:
         db[chat_id][0]["dur"] = exis
         db[chat_id][0]["seconds"] = check[0]["old_second"]
         db[chat_id][0]["speed_path"] = None
-        db[chat_id][0]["speed"] = 1.0
+    db[chat_id][0]["speed"] = 1.0
     if "live_" in queued:
         n, link = await YouTube.video(videoid, True)
         if n == 0:
@@ -3,14 +3,14 @@ from pyrogram.types import Message
 
 from SONALI_MUSIC import app
 from SONALI_MUSIC.core.call import Sona
+from SONALI_MUSIC.core.session import adminlist, get_session
 from SONALI_MUSIC.misc import SUDOERS, db
 from SONALI_MUSIC.utils import AdminRightsCheck
 from SONALI_MUSIC.utils.database import is_active_chat, is_nonadmin_chat
 from SONALI_MUSIC.utils.decorators.language import languageCB
 from SONALI_MUSIC.utils.inline import close_markup, speed_markup
-from config import BANNED_USERS, adminlist
-
-checker = []
+from SONALI_MUSIC.utils.stream.actor import dispatch
+from config import BANNED_USERS
 
 
 @app.on_message(
@@ -77,13 +77,14 @@ async def del_back_playlist(client, CallbackQuery, _):
                 _["admin_29"],
                 show_alert=True,
             )
-    if chat_id in checker:
+    session = get_session(chat_id)
+    if session.speeding:
         return await CallbackQuery.answer(
             _["admin_30"],
             show_alert=True,
         )
     else:
-        checker.append(chat_id)
+        session.speeding = True
     try:
         await CallbackQuery.answer(
             _["admin_31"],
@@ -94,18 +95,18 @@ async def del_back_playlist(client, CallbackQuery, _):
         text=_["admin_32"].format(CallbackQuery.from_user.mention),
     )
     try:
-        await Sona.speedup_stream(
+        await dispatch(
+            chat_id,
+            Sona.speedup_stream,
             chat_id,
             file_path,
             speed,
             playing,
         )
     except:
-        if chat_id in checker:
-            checker.remove(chat_id)
+        session.speeding = False
         return await mystic.edit_text(_["admin_33"], reply_markup=close_markup(_))
-    if chat_id in checker:
-        checker.remove(chat_id)
+    session.speeding = False
     await mystic.edit_text(
         text=_["admin_34"].format(speed, CallbackQuery.from_user.mention),
         reply_markup=close_markup(_),
@@ -6,6 +6,7 @@ from SONALI_MUSIC.core.call import Sona
 from SONALI_MUSIC.utils.database import set_loop
 from SONALI_MUSIC.utils.decorators import AdminRightsCheck
 from SONALI_MUSIC.utils.inline import close_markup
+from SONALI_MUSIC.utils.stream.actor import dispatch
 from config import BANNED_USERS
 
 
@@ -16,7 +17,7 @@ from config import BANNED_USERS
 async def stop_music(cli, message: Message, _, chat_id):
     if not len(message.command) == 1:
         return
-    await Sona.stop_stream(chat_id)
+    await dispatch(chat_id, Sona.stop_stream, chat_id)
     await set_loop(chat_id, 0)
     await message.reply_text(
         _["admin_5"].format(message.from_user.mention), reply_markup=close_markup(_)
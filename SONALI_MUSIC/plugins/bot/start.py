@@ -14,9 +14,9 @@ from SONALI_MUSIC.utils import bot_sys_stats
 from SONALI_MUSIC.utils.database import (
     add_served_chat,
     add_served_user,
-    blacklisted_chats,
     get_lang,
     is_banned_user,
+    is_blacklisted_chat,
     is_on_off,
 )
 from SONALI_MUSIC.utils.decorators.language import LanguageStart
@@ -154,7 +154,7 @@ async def welcome(client, message: Message):
                 if message.chat.type != ChatType.SUPERGROUP:
                     await message.reply_text(_["start_4"])
                     return await app.leave_chat(message.chat.id)
-                if message.chat.id in await blacklisted_chats():
+                if await is_blacklisted_chat(message.chat.id):
                     await message.reply_text(
                         _["start_5"].format(
                             app.mention,
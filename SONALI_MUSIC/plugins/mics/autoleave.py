@@ -5,8 +5,10 @@ from pyrogram.enums import ChatType
 
 import config
 from SONALI_MUSIC import app
-from SONALI_MUSIC.core.call import Sona, autoend
+from SONALI_MUSIC.core.call import Sona
+from SONALI_MUSIC.core.session import sessions
 from SONALI_MUSIC.utils.database import get_client, is_active_chat, is_autoend
+from SONALI_MUSIC.utils.stream.actor import dispatch
 
 
 async def auto_leave():
@@ -54,17 +56,17 @@ async def auto_end():
     while not await asyncio.sleep(5):
         if not await is_autoend():
             continue
-        for chat_id in autoend:
-            timer = autoend.get(chat_id)
+        for session in list(sessions.values()):
+            timer = session.autoend
             if not timer:
                 continue
             if datetime.now() > timer:
-                if not await is_active_chat(chat_id):
-                    autoend[chat_id] = {}
+                chat_id = session.chat_id
+                session.autoend = None
+                if not session.active:
                     continue
-                autoend[chat_id] = {}
                 try:
-                    await Sona.stop_stream(chat_id)
+                    await dispatch(chat_id, Sona.stop_stream, chat_id)
                 except:
                     continue
                 try:
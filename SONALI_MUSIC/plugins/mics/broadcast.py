@@ -5,17 +5,17 @@ from pyrogram.enums import ChatMembersFilter
 from pyrogram.errors import FloodWait
 
 from SONALI_MUSIC import app
+from SONALI_MUSIC.core.session import adminlist
 from SONALI_MUSIC.misc import SUDOERS
 from SONALI_MUSIC.utils.database import (
     get_active_chats,
     get_authuser_names,
     get_client,
-    get_served_chats,
-    get_served_users,
+    get_served_chat_ids,
+    get_served_user_ids,
 )
 from SONALI_MUSIC.utils.decorators.language import language
 from SONALI_MUSIC.utils.formatters import alpha_to_int
-from config import adminlist
 
 IS_BROADCASTING = False
 
@@ -45,105 +45,99 @@ async def braodcast_message(client, message, _):
             return await message.reply_text(_["broad_8"])
 
     IS_BROADCASTING = True
-    await message.reply_text(_["broad_1"])
+    try:
+        await message.reply_text(_["broad_1"])
 
-    if "-nobot" not in message.text:
-        sent = 0
-        pin = 0
-        chats = []
-        schats = await get_served_chats()
-        for chat in schats:
-            chats.append(int(chat["chat_id"]))
-        for i in chats:
-            try:
-                m = (
-                    await app.forward_messages(i, y, x)
-                    if message.reply_to_message
-                    else await app.send_message(i, text=query)
-                )
-                if "-pin" in message.text:
-                    try:
-                        await m.pin(disable_notification=True)
-                        pin += 1
-                    except:
-                        continue
-                elif "-pinloud" in message.text:
-                    try:
-                        await m.pin(disable_notification=False)
-                        pin += 1
-                    except:
+        if "-nobot" not in message.text:
+            sent = 0
+            pin = 0
+            for i in await get_served_chat_ids():
+                try:
+                    m = (
+                        await app.forward_messages(i, y, x)
+                        if message.reply_to_message
+                        else await app.send_message(i, text=query)
+                    )
+                    if "-pin" in message.text:
+                        try:
+                            await m.pin(disable_notification=True)
+                            pin += 1
+                        except:
+                            continue
+                    elif "-pinloud" in message.text:
+                        try:
+                            await m.pin(disable_notification=False)
+                            pin += 1
+                        except:
+                            continue
+                    sent += 1
+                    await asyncio.sleep(0.2)
+                except FloodWait as fw:
+                    flood_time = int(fw.value)
+                    if flood_time > 200:
                         continue
-                sent += 1
-                await asyncio.sleep(0.2)
-            except FloodWait as fw:
-                flood_time = int(fw.value)
-                if flood_time > 200:
+                    await asyncio.sleep(flood_time)
+                except:
                     continue
-                await asyncio.sleep(flood_time)
-            except:
-                continue
-        try:
-            await message.reply_text(_["broad_3"].format(sent, pin))
-        except:
-            pass
-
-    if "-user" in message.text:
-        susr = 0
-        served_users = []
-        susers = await get_served_users()
-        for user in susers:
-            served_users.append(int(user["user_id"]))
-        for i in served_users:
             try:
-                m = (
-                    await app.forward_messages(i, y, x)
-                    if message.reply_to_message
-                    else await app.send_message(i, text=query)
-                )
-                susr += 1
-                await asyncio.sleep(0.2)
-            except FloodWait as fw:
-                flood_time = int(fw.value)
-                if flood_time > 200:
-                    continue
-                await asyncio.sleep(flood_time)
+                await message.reply_text(_["broad_3"].format(sent, pin))
             except:
                 pass
-        try:
-            await message.reply_text(_["broad_4"].format(susr))
-        except:
-            pass
-
-    if "-assistant" in message.text:
-        aw = await message.reply_text(_["broad_5"])
-        text = _["broad_6"]
-        from PURVIMUSIC.core.userbot import assistants
 
-        for num in assistants:
-            sent = 0
-            client = await get_client(num)
-            async for dialog in client.get_dialogs():
+        if "-user" in message.text:
+            susr = 0
+            for i in await get_served_user_ids():
                 try:
-                    await client.forward_messages(
-                        dialog.chat.id, y, x
-                    ) if message.reply_to_message else await client.send_message(
-                        dialog.chat.id, text=query
+                    m = (
+                        await app.forward_messages(i, y, x)
+                        if message.reply_to_message
+                        else await app.send_message(i, text=query)
                     )
-                    sent += 1
-                    await asyncio.sleep(3)
+                    susr += 1
+                    await asyncio.sleep(0.2)
                 except FloodWait as fw:
                     flood_time = int(fw.value)
                     if flood_time > 200:
                         continue
                     await asyncio.sleep(flood_time)
                 except:
-                    continue
-            text += _["broad_7"].format(num, sent)
-        try:
-            await aw.edit_text(text)
-        except:
-            pass
-    IS_BROADCASTING = False
+                    pass
+            try:
+                await message.reply_text(_["broad_4"].format(susr))
+            except:
+                pass
+
+        if "-assistant" in message.text:
+            aw = await message.reply_text(_["broad_5"])
+            text = _["broad_6"]
+            from PURVIMUSIC.core.userbot import assistants
+
+            for num in assistants:
+                sent = 0
+                client = await get_client(num)
+                async for dialog in client.get_dialogs():
+                    try:
+                        await client.forward_messages(
+                            dialog.chat.id, y, x
+                        ) if message.reply_to_message else await client.send_message(
+                            dialog.chat.id, text=query
+                        )
+                        sent += 1
+                        await asyncio.sleep(3)
+                    except FloodWait as fw:
+                        flood_time = int(fw.value)
+                        if flood_time > 200:
+                            continue
+                        await asyncio.sleep(flood_time)
+                    except:
+                        continue
+                text += _["broad_7"].format(num, sent)
+            try:
+                await aw.edit_text(text)
+            except:
+                pass
+    finally:
+        IS_BROADCASTING = False
 
 
 async def auto_clean():
@@ -0,0 +1,22 @@
+import asyncio
+
+from SONALI_MUSIC.core.call import Sona
+from SONALI_MUSIC.core.scheduler import scheduler
+
+HEALTH_CHECK_INTERVAL = 30
+
+
+async def assistant_health():
+    while not await asyncio.sleep(HEALTH_CHECK_INTERVAL):
+        from SONALI_MUSIC.core.userbot import assistants
+
+        for num in assistants:
+            if await Sona.assistant_alive(num):
+                scheduler.mark_healthy(num)
+            elif scheduler.carried_by(num):
+                await Sona.recover_assistant(num)
+            else:
+                scheduler.mark_unhealthy(num)
+
+
+asyncio.create_task(assistant_health())
@@ -0,0 +1,46 @@
+import asyncio
+
+from SONALI_MUSIC.core.call import Sona
+from SONALI_MUSIC.core.session import active_chats
+from SONALI_MUSIC.misc import db
+from SONALI_MUSIC.utils.stream.actor import dispatch
+from SONALI_MUSIC.utils.stream.quality import governor
+
+GOVERNOR_INTERVAL = 20
+RESTREAM_GAP = 5
+
+# Chats still playing on the previous profile, video calls first since
+# they cost the most to keep on a profile the box can no longer carry.
+pending = {}
+
+
+async def quality_governor():
+    while not await asyncio.sleep(GOVERNOR_INTERVAL):
+        try:
+            if not governor.update():
+                continue
+        except:
+            continue
+        pending.clear()
+        pending.update(dict.fromkeys(active_chats(video=True)))
+        pending.update(dict.fromkeys(active_chats()))
+
+
+async def quality_restreamer():
+    # One chat per RESTREAM_GAP, so a profile change never restarts every
+    # ffmpeg at once; each resumes from its current offset.
+    while not await asyncio.sleep(RESTREAM_GAP):
+        while pending:
+            chat_id = next(iter(pending))
+            del pending[chat_id]
+            if chat_id not in active_chats() or not db.get(chat_id):
+                continue
+            try:
+                await dispatch(chat_id, Sona.restream, chat_id)
+            except:
+                pass
+            break
+
+
+asyncio.create_task(quality_governor())
+asyncio.create_task(quality_restreamer())
@@ -11,9 +11,10 @@ from SONALI_MUSIC.utils.database import (
     add_banned_user,
     get_banned_count,
     get_banned_users,
-    get_served_chats,
+    get_served_chat_ids,
     is_banned_user,
     remove_banned_user,
+    served_chats_count,
 )
 from SONALI_MUSIC.utils.decorators.language import language
 from SONALI_MUSIC.utils.extraction import extract_user
@@ -38,14 +39,10 @@ async def global_ban(client, message: Message, _):
         return await message.reply_text(_["gban_4"].format(user.mention))
     if user.id not in BANNED_USERS:
         BANNED_USERS.add(user.id)
-    served_chats = []
-    chats = await get_served_chats()
-    for chat in chats:
-        served_chats.append(int(chat["chat_id"]))
-    time_expected = get_readable_time(len(served_chats))
+    time_expected = get_readable_time(await served_chats_count())
     mystic = await message.reply_text(_["gban_5"].format(user.mention, time_expected))
     number_of_chats = 0
-    for chat_id in served_chats:
+    for chat_id in await get_served_chat_ids():
         try:
             await app.ban_chat_member(chat_id, user.id)
             number_of_chats += 1
@@ -80,14 +77,10 @@ async def global_un(client, message: Message, _):
         return await message.reply_text(_["gban_7"].format(user.mention))
     if user.id in BANNED_USERS:
         BANNED_USERS.remove(user.id)
-    served_chats = []
-    chats = await get_served_chats()
-    for chat in chats:
-        served_chats.append(int(chat["chat_id"]))
-    time_expected = get_readable_time(len(served_chats))
+    time_expected = get_readable_time(await served_chats_count())
     mystic = await message.reply_text(_["gban_8"].format(user.mention, time_expected))
     number_of_chats = 0
-    for chat_id in served_chats:
+    for chat_id in await get_served_chat_ids():
         try:
             await app.unban_chat_member(chat_id, user.id)
             number_of_chats += 1
@@ -2,6 +2,7 @@ from pyrogram import filters
 
 from SONALI_MUSIC import app
 from SONALI_MUSIC.misc import SUDOERS
+from SONALI_MUSIC.utils.cookies import cookies
 from SONALI_MUSIC.utils.database import add_off, add_on
 from SONALI_MUSIC.utils.decorators.language import language
 
@@ -26,5 +27,16 @@ async def logger(client, message, _):
 @app.on_message(filters.command(["cookies"]) & SUDOERS)
 @language
 async def logger(client, message, _):
-    await message.reply_document("cookies/logs.csv")
-    await message.reply_text("Please check given file to cookies file choosing logs...")
+    cookies.refresh(force=True)
+    pool = cookies.stats()
+    if not pool["files"]:
+        return await message.reply_text("No cookie files found in the cookies folder.")
+    text = f"<b>Cookie files :</b> {pool['healthy']}/{pool['files']} healthy\n"
+    for cookie in pool["cookies"]:
+        text += (
+            f"\n<code>{cookie['path']}</code>\n» {cookie['success']}% ok, "
+            f"{cookie['latency']}s avg, {cookie['uses']} uses"
+        )
+        if cookie["quarantined"]:
+            text += f", quarantined for {cookie['quarantined']}s"
+    await message.reply_text(text)
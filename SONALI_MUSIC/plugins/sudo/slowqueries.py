@@ -0,0 +1,49 @@
+from pyrogram import filters
+
+from SONALI_MUSIC import app
+from SONALI_MUSIC.core.mongo import SLOW_QUERY_MS, mongo_client, slowlog
+from SONALI_MUSIC.misc import SUDOERS
+from SONALI_MUSIC.utils.decorators.language import language
+
+
+def _plan(explained: dict, _) -> str:
+    plan = explained.get("queryPlanner", {}).get("winningPlan", {})
+    stages = []
+    while plan:
+        stages.append(plan.get("stage", "?"))
+        plan = plan.get("inputStage") or plan.get("queryPlan") or {}
+    stats = explained.get("executionStats", {})
+    examined = stats.get("totalDocsExamined")
+    text = " <- ".join(stages) or "unknown"
+    if examined is not None:
+        text += _["slow_4"].format(examined)
+    return text
+
+
+async def _explain(client, query: dict, _) -> str:
+    collection = client[query["database"]][query["collection"]]
+    try:
+        explained = await collection.find(query["filter"]).explain()
+    except Exception as e:
+        return _["slow_3"].format(type(e).__name__)
+    return _plan(explained, _)
+
+
+@app.on_message(filters.command(["slowqueries", "slowlog"]) & SUDOERS)
+@language
+async def slow_queries(client, message, _):
+    if not slowlog.slow:
+        return await message.reply_text(_["slow_1"].format(SLOW_QUERY_MS))
+    worst = {}
+    for query in slowlog.slow:
+        key = (query["database"], query["collection"], query["command"], str(query["filter"]))
+        if key not in worst or worst[key]["ms"] < query["ms"]:
+            worst[key] = query
+    text = _["slow_2"]
+    for query in sorted(worst.values(), key=lambda query: query["ms"], reverse=True)[:10]:
+        text += (
+            f"\n<code>{query['ms']}ms</code> {query['command']} "
+            f"<code>{query['database']}.{query['collection']}</code> "
+            f"<code>{query['filter']}</code>\n» {await _explain(mongo_client(), query, _)}\n"
+        )
+    await message.reply_text(text)
@@ -2,19 +2,25 @@ import asyncio
 import os
 
 from pyrogram import filters
-from pyrogram.errors import FloodWait
 from pyrogram.types import CallbackQuery, InputMediaPhoto, Message
 
 import config
 from SONALI_MUSIC import app
+from SONALI_MUSIC.core.session import get_session
 from SONALI_MUSIC.misc import db
 from SONALI_MUSIC.utils import SonaBin, get_channeplayCB, seconds_to_min
 from SONALI_MUSIC.utils.database import get_cmode, is_active_chat, is_music_playing
 from SONALI_MUSIC.utils.decorators.language import language, languageCB
+from SONALI_MUSIC.utils.edit_scheduler import editor
 from SONALI_MUSIC.utils.inline import queue_back_markup, queue_markup
+from SONALI_MUSIC.utils.stream.clock import get_played
 from config import BANNED_USERS
 
-basic = {}
+def basic(chat_id) -> dict:
+    session = get_session(chat_id)
+    if session.timers is None:
+        session.timers = {}
+    return session.timers
 
 
 def get_image(videoid):
@@ -24,6 +30,27 @@ def get_image(videoid):
         return config.YOUTUBE_IMG_URL
 
 
+def queue_timer(_, chat_id, videoid, DUR, cplay):
+    async def render():
+        playing = db.get(chat_id)
+        if not playing or playing[0]["vidid"] != videoid:
+            return False
+        if not await is_active_chat(chat_id) or not basic(chat_id).get(videoid):
+            return False
+        if not await is_music_playing(chat_id):
+            return None
+        return queue_markup(
+            _,
+            DUR,
+            cplay,
+            videoid,
+            seconds_to_min(get_played(chat_id)),
+            playing[0]["dur"],
+        )
+
+    return render
+
+
 def get_duration(playing):
     file_path = playing[0]["file"]
     if "index_" in file_path or "live_" in file_path:
@@ -92,39 +119,16 @@ async def get_queue(client, message: Message, _):
             DUR,
             "c" if cplay else "g",
             videoid,
-            seconds_to_min(got[0]["played"]),
+            seconds_to_min(get_played(chat_id)),
             got[0]["dur"],
         )
     )
-    basic[videoid] = True
+    basic(chat_id)[videoid] = True
     mystic = await message.reply_photo(IMAGE, caption=cap, reply_markup=upl)
     if DUR != "Unknown":
-        try:
-            while db[chat_id][0]["vidid"] == videoid:
-                await asyncio.sleep(5)
-                if await is_active_chat(chat_id):
-                    if basic[videoid]:
-                        if await is_music_playing(chat_id):
-                            try:
-                                buttons = queue_markup(
-                                    _,
-                                    DUR,
-                                    "c" if cplay else "g",
-                                    videoid,
-                                    seconds_to_min(db[chat_id][0]["played"]),
-                                    db[chat_id][0]["dur"],
-                                )
-                                await mystic.edit_reply_markup(reply_markup=buttons)
-                            except FloodWait:
-                                pass
-                        else:
-                            pass
-                    else:
-                        break
-                else:
-                    break
-        except:
-            return
+        editor.watch(
+            mystic, queue_timer(_, chat_id, videoid, DUR, "c" if cplay else "g")
+        )
 
 
 @app.on_callback_query(filters.regex("GetTimer") & ~BANNED_USERS)
@@ -153,7 +157,7 @@ async def queued_tracks(client, CallbackQuery: CallbackQuery, _):
     if len(got) == 1:
         return await CallbackQuery.answer(_["queue_5"], show_alert=True)
     await CallbackQuery.answer()
-    basic[videoid] = False
+    basic(chat_id)[videoid] = False
     buttons = queue_back_markup(_, what)
     med = InputMediaPhoto(
         media="https://telegra.ph//file/6f7d35131f69951c74ee5.jpg",
@@ -232,38 +236,13 @@ async def queue_back(client, CallbackQuery: CallbackQuery, _):
             DUR,
             cplay,
             videoid,
-            seconds_to_min(got[0]["played"]),
+            seconds_to_min(get_played(chat_id)),
             got[0]["dur"],
         )
     )
-    basic[videoid] = True
+    basic(chat_id)[videoid] = True
 
     med = InputMediaPhoto(media=IMAGE, caption=cap)
     mystic = await CallbackQuery.edit_message_media(media=med, reply_markup=upl)
     if DUR != "Unknown":
-        try:
-            while db[chat_id][0]["vidid"] == videoid:
-                await asyncio.sleep(5)
-                if await is_active_chat(chat_id):
-                    if basic[videoid]:
-                        if await is_music_playing(chat_id):
-                            try:
-                                buttons = queue_markup(
-                                    _,
-                                    DUR,
-                                    cplay,
-                                    videoid,
-                                    seconds_to_min(db[chat_id][0]["played"]),
-                                    db[chat_id][0]["dur"],
-                                )
-                                await mystic.edit_reply_markup(reply_markup=buttons)
-                            except FloodWait:
-                                pass
-                        else:
-                            pass
-                    else:
-                        break
-                else:
-                    break
-        except:
-            return
+        editor.watch(mystic, queue_timer(_, chat_id, videoid, DUR, cplay))
@@ -15,17 +15,18 @@ load_dotenv()
 
 from SONALI_MUSIC import app
 from SONALI_MUSIC.core.call import Sona
+from SONALI_MUSIC.core.session import SessionView, adminlist
 from SONALI_MUSIC.misc import db
 from SONALI_MUSIC.utils.database import get_assistant, get_authuser_names, get_cmode
 from SONALI_MUSIC.utils.decorators import ActualAdminCB, AdminActual, language
 from SONALI_MUSIC.utils.formatters import alpha_to_int, get_readable_time
-from config import BANNED_USERS, adminlist, lyrical
+from config import BANNED_USERS, lyrical
 BOT_TOKEN = getenv("BOT_TOKEN", "")
 MONGO_DB_URI = getenv("MONGO_DB_URI", "")
 STRING_SESSION = getenv("STRING_SESSION", "")
 from dotenv import load_dotenv
 
-rel = {}
+rel = SessionView("reloaded")
 
 
 #--------------------------------------------------------------------------------------------------------------------------------------------------------------------
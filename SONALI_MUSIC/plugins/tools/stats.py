@@ -10,12 +10,25 @@ from pytgcalls.__version__ import __version__ as pytgver
 
 import config
 from SONALI_MUSIC import app
+from SONALI_MUSIC.core.mongo import poollog
 from SONALI_MUSIC.core.userbot import assistants
 from SONALI_MUSIC.misc import SUDOERS, mongodb
 from SONALI_MUSIC.plugins import ALL_MODULES
-from SONALI_MUSIC.utils.database import get_served_chats, get_served_users, get_sudoers
+from SONALI_MUSIC.utils.bulk import writer
+from SONALI_MUSIC.utils.cache import cache_stats
+from SONALI_MUSIC.utils.database import (
+    get_sudoers,
+    served_chats_count,
+    served_users_count,
+)
 from SONALI_MUSIC.utils.decorators.language import language, languageCB
+from SONALI_MUSIC.utils.extractor import extractor
 from SONALI_MUSIC.utils.inline.stats import back_stats_buttons, stats_buttons
+from SONALI_MUSIC.utils.formatters import convert_bytes
+from SONALI_MUSIC.utils.stream.actor import inbox_stats
+from SONALI_MUSIC.utils.stream.mediacache import media
+from SONALI_MUSIC.utils.stream.quality import governor
+from SONALI_MUSIC.utils.stream.urlcache import urls
 from config import BANNED_USERS
 
 
@@ -50,8 +63,8 @@ async def overall_stats(client, CallbackQuery, _):
     except:
         pass
     await CallbackQuery.edit_message_text(_["gstats_1"].format(app.mention))
-    served_chats = len(await get_served_chats())
-    served_users = len(await get_served_users())
+    served_chats = await served_chats_count()
+    served_users = await served_users_count()
     text = _["gstats_3"].format(
         app.mention,
         len(assistants),
@@ -101,8 +114,8 @@ async def bot_stats(client, CallbackQuery, _):
     call = await mongodb.command("dbstats")
     datasize = call["dataSize"] / 1024
     storage = call["storageSize"] / 1024
-    served_chats = len(await get_served_chats())
-    served_users = len(await get_served_users())
+    served_chats = await served_chats_count()
+    served_users = await served_users_count()
     text = _["gstats_5"].format(
         app.mention,
         len(ALL_MODULES),
@@ -126,6 +139,42 @@ async def bot_stats(client, CallbackQuery, _):
         call["collections"],
         call["objects"],
     )
+    inbox = inbox_stats()
+    text += (
+        f"\n\n<b>ᴘʟᴧʏʙᴧᴄᴋ ɪηʙσx :</b> <code>{inbox['p95']}ms p95 / {inbox['max']}ms max</code>"
+    )
+    quality = governor.stats()
+    text += (
+        f"\n<b>sᴛʀᴇᴧᴍ ǫᴜᴧʟɪᴛʏ :</b> <code>{quality['profile']} ({quality['pressure']}% load, "
+        f"{quality['reason']}, {quality['since']}s ago)</code>"
+    )
+    bulk = writer.stats()
+    text += (
+        f"\n<b>ʙᴜʟᴋ ᴡʀɪᴛᴇs :</b> <code>{bulk['depth']} queued, {bulk['p50']}ms p50 / {bulk['max']}ms max flush</code>"
+    )
+    pool = poollog.stats()
+    text += (
+        f"\n<b>ᴍᴏɴɢᴏ ᴘᴏᴏʟ :</b> <code>{pool['p50']}ms p50 / {pool['p95']}ms p95 checkout</code>"
+    )
+    cache = cache_stats()
+    text += (
+        f"\n<b>ᴅʙ ᴄᴧᴄʜᴇ :</b> <code>{cache['ratio']}% hits ({cache['hits']} / {cache['misses']} misses)</code>"
+    )
+    files = media.stats()
+    text += (
+        f"\n<b>ᴍᴇᴅɪᴧ ᴄᴧᴄʜᴇ :</b> <code>{files['ratio']}% hits, {files['joined']} joined, "
+        f"{convert_bytes(files['saved']) or '0 B'} saved, "
+        f"{convert_bytes(files['used']) or '0 B'} / {convert_bytes(files['limit'])} used</code>"
+    )
+    streams = urls.stats()
+    text += (
+        f"\n<b>sᴛʀᴇᴧᴍ ᴜʀʟs :</b> <code>{streams['ratio']}% hits, {streams['refreshed']} refreshed, "
+        f"{streams['discarded']} dropped</code>"
+    )
+    ytdlp = extractor.stats()
+    text += (
+        f"\n<b>ʏᴛ-ᴅʟᴘ :</b> <code>{ytdlp['pool']}ms p50 in-process / {ytdlp['cli']}ms p50 cli</code>"
+    )
     med = InputMediaPhoto(media=config.STATS_IMG_URL, caption=text)
     try:
         await CallbackQuery.edit_message_media(media=med, reply_markup=upl)
@@ -0,0 +1,100 @@
+import asyncio
+import time
+from collections import deque
+
+from SONALI_MUSIC.logging import LOGGER
+
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 2
+
+
+class BulkWriter:
+    """Batches Mongo writes into ordered bulk_write calls.
+
+    A batch goes out once BATCH_SIZE operations are waiting or
+    FLUSH_INTERVAL seconds after the first one was queued. Batches are
+    ordered so a delete and a later upsert of the same key keep their order.
+    """
+
+    def __init__(self):
+        self.queue = None
+        self.task = None
+        self.pending = []
+        self.latencies = deque(maxlen=200)
+        self.written = 0
+        self.failed = 0
+
+    def start(self):
+        if self.queue is None:
+            self.queue = asyncio.Queue()
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    def put(self, collection, operation):
+        self.start()
+        self.queue.put_nowait((collection, operation))
+
+    def depth(self) -> int:
+        return self.queue.qsize() if self.queue else 0
+
+    async def run(self):
+        while True:
+            batch = self.pending = [await self.queue.get()]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while len(batch) < BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self.write(batch)
+            self.pending = []
+
+    async def write(self, batch: list):
+        grouped = {}
+        for collection, operation in batch:
+            grouped.setdefault(collection.full_name, (collection, []))[1].append(
+                operation
+            )
+        started = time.monotonic()
+        for collection, operations in grouped.values():
+            try:
+                await collection.bulk_write(operations, ordered=True)
+                self.written += len(operations)
+            except Exception as e:
+                self.failed += len(operations)
+                LOGGER(__name__).warning(
+                    f"Bulk write of {len(operations)} ops to {collection.name} failed: {e}"
+                )
+        self.latencies.append(time.monotonic() - started)
+
+    async def flush(self):
+        if not self.queue:
+            return
+        if self.task and not self.task.done():
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+        # Replaying a half-written batch in order ends in the same state.
+        batch, self.pending = self.pending, []
+        while not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+            if len(batch) >= BATCH_SIZE:
+                await self.write(batch)
+                batch = []
+        if batch:
+            await self.write(batch)
+
+    def stats(self) -> dict:
+        ordered = sorted(self.latencies)
+        return {
+            "depth": self.depth(),
+            "written": self.written,
+            "failed": self.failed,
+            "p50": round(ordered[len(ordered) // 2] * 1000, 1) if ordered else 0.0,
+            "max": round(ordered[-1] * 1000, 1) if ordered else 0.0,
+        }
+
+
+writer = BulkWriter()
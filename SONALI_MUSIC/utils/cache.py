@@ -0,0 +1,137 @@
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+
+MISSING = object()
+
+caches = {}
+
+
+class SingleFlight(dict):
+    """In-flight tasks by key, so concurrent callers share one run.
+
+    A task is dropped once it finishes; a failure reaches every waiter and
+    is also passed to on_error(key, error) if given.
+    """
+
+    def __init__(self, on_error=None):
+        super().__init__()
+        self.on_error = on_error
+
+    def start(self, key, load) -> tuple:
+        """Return the task running for key, starting load() if there is none."""
+        task = self.get(key)
+        if task is not None:
+            return task, False
+        task = self[key] = asyncio.ensure_future(load())
+        task.add_done_callback(functools.partial(self.settle, key))
+        return task, True
+
+    def owns(self, key) -> bool:
+        """Whether the running task is still the one registered for key."""
+        return self.get(key) is asyncio.current_task()
+
+    def settle(self, key, task):
+        if self.get(key) is task:
+            del self[key]
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error and self.on_error:
+            self.on_error(key, error)
+
+
+class AsyncCache:
+    """TTL + LRU cache around an async function.
+
+    Results are looked up against a sentinel, so None, False and empty
+    results are cached like any other value. Concurrent misses for the
+    same arguments share one call instead of each running the function.
+    """
+
+    def __init__(self, func, ttl: float, maxsize: int):
+        self.func = func
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.inflight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        functools.update_wrapper(self, func)
+        caches[f"{func.__module__}.{func.__qualname__}"] = self
+
+    @staticmethod
+    def key(args, kwargs) -> tuple:
+        if kwargs:
+            return args + tuple(sorted(kwargs.items()))
+        return args
+
+    async def __call__(self, *args, **kwargs):
+        key = self.key(args, kwargs)
+        entry = self.entries.get(key, MISSING)
+        if entry is not MISSING and entry[1] > time.monotonic():
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[0]
+        task, started = self.inflight.start(
+            key, lambda: self.load(key, args, kwargs)
+        )
+        if started:
+            self.misses += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    async def load(self, key, args, kwargs):
+        value = await self.func(*args, **kwargs)
+        if self.inflight.owns(key):
+            self.set(value, *key)
+        return value
+
+    def set(self, value, *args):
+        self.entries[args] = (value, time.monotonic() + self.ttl)
+        self.entries.move_to_end(args)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, *args):
+        """Drop every entry whose arguments start with args, or all of them."""
+        for key in [key for key in self.inflight if key[: len(args)] == args]:
+            del self.inflight[key]
+        if not args:
+            return self.entries.clear()
+        if self.entries.pop(args, MISSING) is not MISSING:
+            return
+        for key in [key for key in self.entries if key[: len(args)] == args]:
+            del self.entries[key]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared": self.shared,
+            "ratio": round(self.hits / total * 100, 1) if total else 0.0,
+        }
+
+
+def cached(ttl: float = 300, maxsize: int = 4096):
+    def decorator(func):
+        return AsyncCache(func, ttl, maxsize)
+
+    return decorator
+
+
+def cache_stats() -> dict:
+    hits = sum(cache.hits for cache in caches.values())
+    misses = sum(cache.misses for cache in caches.values())
+    total = hits + misses
+    return {
+        "caches": len(caches),
+        "hits": hits,
+        "misses": misses,
+        "ratio": round(hits / total * 100, 1) if total else 0.0,
+    }
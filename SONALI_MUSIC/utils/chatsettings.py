@@ -0,0 +1,170 @@
+import asyncio
+
+from pymongo import UpdateOne
+
+from SONALI_MUSIC.core.mongo import mongodb
+from SONALI_MUSIC.logging import LOGGER
+from SONALI_MUSIC.utils.bulk import writer
+
+settingsdb = mongodb.chatsettings
+
+FLUSH_INTERVAL = 5
+MIGRATION_ID = "migration"
+
+LEGACY = {
+    "lang": (mongodb.language, "lang"),
+    "playmode": (mongodb.playmode, "mode"),
+    "playtype": (mongodb.playtypedb, "mode"),
+    "cmode": (mongodb.cplaymode, "mode"),
+    "upvotes": (mongodb.upcount, "mode"),
+    # Presence of a document is the setting for these two.
+    "skipmode": (mongodb.skipmode, None),
+    "nonadmin": (mongodb.adminauth, None),
+}
+
+settings = {}
+loading = {}
+dirty = {}
+migrated = []
+task = None
+
+
+class ChatSettings:
+    """Every per-chat setting, stored as one document per chat."""
+
+    __slots__ = (
+        "chat_id",
+        "lang",
+        "playmode",
+        "playtype",
+        "cmode",
+        "skipmode",
+        "upvotes",
+        "nonadmin",
+    )
+
+    def __init__(self, chat_id: int, **values):
+        self.chat_id = chat_id
+        self.lang = values.get("lang", "en")
+        self.playmode = values.get("playmode", "Direct")
+        self.playtype = values.get("playtype", "Everyone")
+        self.cmode = values.get("cmode")
+        self.skipmode = values.get("skipmode", True)
+        self.upvotes = values.get("upvotes", 5)
+        self.nonadmin = values.get("nonadmin", False)
+
+    def document(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+async def _legacy(chat_id: int) -> dict:
+    names = list(LEGACY)
+    found = await asyncio.gather(
+        *[LEGACY[name][0].find_one({"chat_id": chat_id}) for name in names]
+    )
+    values = {}
+    for name, doc in zip(names, found):
+        if not doc:
+            continue
+        key = LEGACY[name][1]
+        if name == "skipmode":
+            values[name] = False
+        elif name == "nonadmin":
+            values[name] = True
+        else:
+            values[name] = doc[key]
+    return values
+
+
+async def _load(chat_id: int) -> ChatSettings:
+    doc = await settingsdb.find_one({"chat_id": chat_id}, {"_id": 0})
+    if doc:
+        doc.pop("chat_id", None)
+        return ChatSettings(chat_id, **doc)
+    if not migrated:
+        return ChatSettings(chat_id, **await _legacy(chat_id))
+    return ChatSettings(chat_id)
+
+
+async def get_settings(chat_id: int) -> ChatSettings:
+    chat = settings.get(chat_id)
+    if chat:
+        return chat
+    future = loading.get(chat_id)
+    if not future:
+        future = loading[chat_id] = asyncio.ensure_future(_load(chat_id))
+    try:
+        chat = await asyncio.shield(future)
+    finally:
+        if loading.get(chat_id) is future:
+            loading.pop(chat_id, None)
+    return settings.setdefault(chat_id, chat)
+
+
+async def update_settings(chat_id: int, **values):
+    chat = await get_settings(chat_id)
+    for name, value in values.items():
+        setattr(chat, name, value)
+    dirty.setdefault(chat_id, set()).update(values)
+    _start()
+
+
+def _start():
+    global task
+    if task is None or task.done():
+        task = asyncio.create_task(_flush_loop())
+
+
+async def _flush_loop():
+    while not await asyncio.sleep(FLUSH_INTERVAL):
+        await flush_settings()
+
+
+async def flush_settings():
+    for chat_id in list(dirty):
+        names = dirty.pop(chat_id)
+        chat = settings.get(chat_id)
+        if not chat:
+            continue
+        writer.put(
+            settingsdb,
+            UpdateOne(
+                {"chat_id": chat_id},
+                {"$set": {name: getattr(chat, name) for name in names}},
+                upsert=True,
+            ),
+        )
+
+
+async def migrate_settings():
+    if await settingsdb.find_one({"chat_id": MIGRATION_ID}):
+        migrated.append(True)
+        return
+    folded = {}
+    for name, (collection, key) in LEGACY.items():
+        async for doc in collection.find({}):
+            if "chat_id" not in doc:
+                continue
+            if name == "skipmode":
+                value = False
+            elif name == "nonadmin":
+                value = True
+            else:
+                value = doc.get(key)
+            folded.setdefault(doc["chat_id"], {})[name] = value
+    for chat_id, values in folded.items():
+        await settingsdb.update_one(
+            {"chat_id": chat_id}, {"$set": values}, upsert=True
+        )
+    # Chats cached from the old collections may have changed meanwhile.
+    for chat_id, chat in settings.items():
+        dirty.setdefault(chat_id, set()).update(
+            name for name in chat.__slots__ if name != "chat_id"
+        )
+    await settingsdb.update_one(
+        {"chat_id": MIGRATION_ID}, {"$set": {"done": True}}, upsert=True
+    )
+    migrated.append(True)
+    if dirty:
+        _start()
+    LOGGER(__name__).info(f"Folded the settings of {len(folded)} chats into one collection.")
@@ -0,0 +1,154 @@
+import os
+import random
+import time
+
+from SONALI_MUSIC.logging import LOGGER
+
+COOKIE_DIR = "cookies"
+RESCAN_INTERVAL = 30
+QUARANTINE = 600
+MAX_QUARANTINE = 6 * 3600
+MAX_FAILURES = 3
+ALPHA = 0.2
+
+BOT_CHECK = (
+    "confirm you're not a bot",
+    "confirm you’re not a bot",
+    "sign in to confirm",
+    "http error 429",
+    "too many requests",
+)
+NOT_OUR_FAULT = (
+    "video unavailable",
+    "private video",
+    "members-only",
+    "has been removed",
+    "not available in your country",
+    "premieres in",
+)
+
+
+class CookieFile:
+    __slots__ = (
+        "path",
+        "mtime",
+        "success",
+        "latency",
+        "failures",
+        "strikes",
+        "until",
+        "uses",
+    )
+
+    def __init__(self, path: str, mtime: float):
+        self.path = path
+        self.mtime = mtime
+        self.success = 1.0
+        self.latency = 0.0
+        self.failures = 0
+        self.strikes = 0
+        self.until = 0.0
+        self.uses = 0
+
+    def healthy(self, now: float) -> bool:
+        return self.until <= now
+
+    def weight(self) -> float:
+        return max(self.success, 0.05) / (1 + self.latency / 10)
+
+
+class CookiePool:
+    """Cookie files for yt-dlp, scored by how extractions with them went.
+
+    Requests go to healthy files weighted by recent success and latency. A
+    bot check, or MAX_FAILURES failures in a row, quarantines a file for a
+    while that doubles with every repeat offence.
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.checked = 0.0
+
+    def refresh(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self.checked < RESCAN_INTERVAL:
+            return
+        self.checked = now
+        found = {}
+        if os.path.isdir(COOKIE_DIR):
+            for entry in os.scandir(COOKIE_DIR):
+                if entry.name.endswith(".txt") and entry.is_file():
+                    found[f"{COOKIE_DIR}/{entry.name}"] = entry.stat().st_mtime
+        for path in list(self.files):
+            if path not in found:
+                del self.files[path]
+        for path, mtime in found.items():
+            current = self.files.get(path)
+            if current is None or current.mtime != mtime:
+                if current is not None:
+                    LOGGER(__name__).info(f"Cookie file {path} changed, health reset.")
+                self.files[path] = CookieFile(path, mtime)
+
+    def pick(self) -> str:
+        self.refresh()
+        if not self.files:
+            raise FileNotFoundError("No .txt files found in the specified folder.")
+        now = time.time()
+        healthy = [cookie for cookie in self.files.values() if cookie.healthy(now)]
+        if healthy:
+            cookie = random.choices(healthy, [cookie.weight() for cookie in healthy])[0]
+        else:
+            cookie = min(self.files.values(), key=lambda cookie: cookie.until)
+            LOGGER(__name__).warning(
+                f"Every cookie file is quarantined, using {cookie.path} anyway."
+            )
+        cookie.uses += 1
+        return cookie.path
+
+    def report(self, path: str, ok: bool, latency: float = None, error=None):
+        cookie = self.files.get(path)
+        if cookie is None:
+            return
+        if latency is not None:
+            cookie.latency += ALPHA * (latency - cookie.latency)
+        if ok:
+            cookie.success += ALPHA * (1 - cookie.success)
+            cookie.failures = 0
+            cookie.strikes = 0
+            return
+        text = str(error or "").lower()
+        if any(reason in text for reason in NOT_OUR_FAULT):
+            return
+        cookie.success -= ALPHA * cookie.success
+        cookie.failures += 1
+        if any(reason in text for reason in BOT_CHECK) or cookie.failures >= MAX_FAILURES:
+            self.quarantine(cookie, text[:100])
+
+    def quarantine(self, cookie: CookieFile, reason: str):
+        cookie.strikes += 1
+        cookie.failures = 0
+        hold = min(QUARANTINE * 2 ** (cookie.strikes - 1), MAX_QUARANTINE)
+        cookie.until = time.time() + hold
+        LOGGER(__name__).warning(
+            f"Cookie file {cookie.path} quarantined for {hold}s: {reason or 'repeated failures'}"
+        )
+
+    def stats(self) -> dict:
+        now = time.time()
+        return {
+            "files": len(self.files),
+            "healthy": sum(1 for cookie in self.files.values() if cookie.healthy(now)),
+            "cookies": [
+                {
+                    "path": cookie.path,
+                    "success": round(cookie.success * 100),
+                    "latency": round(cookie.latency, 2),
+                    "uses": cookie.uses,
+                    "quarantined": max(0, int(cookie.until - now)),
+                }
+                for cookie in self.files.values()
+            ],
+        }
+
+
+cookies = CookiePool()
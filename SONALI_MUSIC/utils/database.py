@@ -1,42 +1,37 @@
-import random
+import asyncio
 from typing import Dict, List, Union
 
-from SONALI_MUSIC import userbot
+from pymongo import UpdateOne
+
 from SONALI_MUSIC.core.mongo import mongodb
+from SONALI_MUSIC.core.scheduler import scheduler
+from SONALI_MUSIC.core.session import active_chats, find_session, get_session
+from SONALI_MUSIC.utils.bulk import writer
+from SONALI_MUSIC.utils.cache import cached
+from SONALI_MUSIC.utils.chatsettings import get_settings, update_settings
 
-authdb = mongodb.adminauth
 authuserdb = mongodb.authuser
 autoenddb = mongodb.autoend
 assdb = mongodb.assistants
 blacklist_chatdb = mongodb.blacklistChat
 blockeddb = mongodb.blockedusers
 chatsdb = mongodb.chats
-channeldb = mongodb.cplaymode
-countdb = mongodb.upcount
 gbansdb = mongodb.gban
-langdb = mongodb.language
 onoffdb = mongodb.onoffper
-playmodedb = mongodb.playmode
-playtypedb = mongodb.playtypedb
-skipdb = mongodb.skipmode
 sudoersdb = mongodb.sudoers
 usersdb = mongodb.tgusersdb
 
 # Shifting to memory [mongo sucks often]
-active = []
-activevideo = []
 assistantdict = {}
-autoend = {}
-count = {}
-channelconnect = {}
-langm = {}
-loop = {}
 maintenance = []
-nonadmin = {}
-pause = {}
-playmode = {}
-playtype = {}
-skipmode = {}
+
+# Loaded once at boot by load_memberships, then kept in sync on every write
+served_users = set()
+served_chats = set()
+blacklisted = set()
+gbanned = set()
+blocked = set()
+loaded = []
 
 
 async def get_assistant_number(chat_id: int) -> str:
@@ -45,16 +40,7 @@ async def get_assistant_number(chat_id: int) -> str:
 
 
 async def get_client(assistant: int):
-    if int(assistant) == 1:
-        return userbot.one
-    elif int(assistant) == 2:
-        return userbot.two
-    elif int(assistant) == 3:
-        return userbot.three
-    elif int(assistant) == 4:
-        return userbot.four
-    elif int(assistant) == 5:
-        return userbot.five
+    return scheduler.get_client(assistant)
 
 
 async def set_assistant_new(chat_id, number):
@@ -69,7 +55,7 @@ async def set_assistant_new(chat_id, number):
 async def set_assistant(chat_id):
     from SONALI_MUSIC.core.userbot import assistants
 
-    ran_assistant = random.choice(assistants)
+    ran_assistant = scheduler.pick(assistants)
     assistantdict[chat_id] = ran_assistant
     await assdb.update_one(
         {"chat_id": chat_id},
@@ -91,7 +77,7 @@ async def get_assistant(chat_id: int) -> str:
             return userbot
         else:
             got_assis = dbassistant["assistant"]
-            if got_assis in assistants:
+            if got_assis in assistants and scheduler.is_healthy(got_assis):
                 assistantdict[chat_id] = got_assis
                 userbot = await get_client(got_assis)
                 return userbot
@@ -99,7 +85,7 @@ async def get_assistant(chat_id: int) -> str:
                 userbot = await set_assistant(chat_id)
                 return userbot
     else:
-        if assistant in assistants:
+        if assistant in assistants and scheduler.is_healthy(assistant):
             userbot = await get_client(assistant)
             return userbot
         else:
@@ -110,7 +96,7 @@ async def get_assistant(chat_id: int) -> str:
 async def set_calls_assistant(chat_id):
     from SONALI_MUSIC.core.userbot import assistants
 
-    ran_assistant = random.choice(assistants)
+    ran_assistant = scheduler.pick(assistants)
     assistantdict[chat_id] = ran_assistant
     await assdb.update_one(
         {"chat_id": chat_id},
@@ -140,62 +126,30 @@ async def group_assistant(self, chat_id: int) -> int:
             assis = assistant
         else:
             assis = await set_calls_assistant(chat_id)
-    if int(assis) == 1:
-        return self.one
-    elif int(assis) == 2:
-        return self.two
-    elif int(assis) == 3:
-        return self.three
-    elif int(assis) == 4:
-        return self.four
-    elif int(assis) == 5:
-        return self.five
+    return self.calls[int(assis)]
 
 
 async def is_skipmode(chat_id: int) -> bool:
-    mode = skipmode.get(chat_id)
-    if not mode:
-        user = await skipdb.find_one({"chat_id": chat_id})
-        if not user:
-            skipmode[chat_id] = True
-            return True
-        skipmode[chat_id] = False
-        return False
-    return mode
+    return (await get_settings(chat_id)).skipmode
 
 
 async def skip_on(chat_id: int):
-    skipmode[chat_id] = True
-    user = await skipdb.find_one({"chat_id": chat_id})
-    if user:
-        return await skipdb.delete_one({"chat_id": chat_id})
+    await update_settings(chat_id, skipmode=True)
 
 
 async def skip_off(chat_id: int):
-    skipmode[chat_id] = False
-    user = await skipdb.find_one({"chat_id": chat_id})
-    if not user:
-        return await skipdb.insert_one({"chat_id": chat_id})
+    await update_settings(chat_id, skipmode=False)
 
 
 async def get_upvote_count(chat_id: int) -> int:
-    mode = count.get(chat_id)
-    if not mode:
-        mode = await countdb.find_one({"chat_id": chat_id})
-        if not mode:
-            return 5
-        count[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    return (await get_settings(chat_id)).upvotes
 
 
 async def set_upvotes(chat_id: int, mode: int):
-    count[chat_id] = mode
-    await countdb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
+    await update_settings(chat_id, upvotes=mode)
 
 
+@cached()
 async def is_autoend() -> bool:
     chat_id = 1234
     user = await autoenddb.find_one({"chat_id": chat_id})
@@ -207,189 +161,132 @@ async def is_autoend() -> bool:
 async def autoend_on():
     chat_id = 1234
     await autoenddb.insert_one({"chat_id": chat_id})
+    is_autoend.invalidate()
 
 
 async def autoend_off():
     chat_id = 1234
     await autoenddb.delete_one({"chat_id": chat_id})
+    is_autoend.invalidate()
 
 
 async def get_loop(chat_id: int) -> int:
-    lop = loop.get(chat_id)
-    if not lop:
+    session = find_session(chat_id)
+    if not session:
         return 0
-    return lop
+    return session.loop
 
 
 async def set_loop(chat_id: int, mode: int):
-    loop[chat_id] = mode
+    get_session(chat_id).loop = mode
 
 
 async def get_cmode(chat_id: int) -> int:
-    mode = channelconnect.get(chat_id)
-    if not mode:
-        mode = await channeldb.find_one({"chat_id": chat_id})
-        if not mode:
-            return None
-        channelconnect[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    return (await get_settings(chat_id)).cmode
 
 
 async def set_cmode(chat_id: int, mode: int):
-    channelconnect[chat_id] = mode
-    await channeldb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
+    await update_settings(chat_id, cmode=mode)
 
 
 async def get_playtype(chat_id: int) -> str:
-    mode = playtype.get(chat_id)
-    if not mode:
-        mode = await playtypedb.find_one({"chat_id": chat_id})
-        if not mode:
-            playtype[chat_id] = "Everyone"
-            return "Everyone"
-        playtype[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    return (await get_settings(chat_id)).playtype
 
 
 async def set_playtype(chat_id: int, mode: str):
-    playtype[chat_id] = mode
-    await playtypedb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
+    await update_settings(chat_id, playtype=mode)
 
 
 async def get_playmode(chat_id: int) -> str:
-    mode = playmode.get(chat_id)
-    if not mode:
-        mode = await playmodedb.find_one({"chat_id": chat_id})
-        if not mode:
-            playmode[chat_id] = "Direct"
-            return "Direct"
-        playmode[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    return (await get_settings(chat_id)).playmode
 
 
 async def set_playmode(chat_id: int, mode: str):
-    playmode[chat_id] = mode
-    await playmodedb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
+    await update_settings(chat_id, playmode=mode)
 
 
 async def get_lang(chat_id: int) -> str:
-    mode = langm.get(chat_id)
-    if not mode:
-        lang = await langdb.find_one({"chat_id": chat_id})
-        if not lang:
-            langm[chat_id] = "en"
-            return "en"
-        langm[chat_id] = lang["lang"]
-        return lang["lang"]
-    return mode
+    return (await get_settings(chat_id)).lang
 
 
 async def set_lang(chat_id: int, lang: str):
-    langm[chat_id] = lang
-    await langdb.update_one({"chat_id": chat_id}, {"$set": {"lang": lang}}, upsert=True)
+    await update_settings(chat_id, lang=lang)
 
 
 async def is_music_playing(chat_id: int) -> bool:
-    mode = pause.get(chat_id)
-    if not mode:
+    session = find_session(chat_id)
+    if not session:
         return False
-    return mode
+    return session.playing
 
 
 async def music_on(chat_id: int):
-    pause[chat_id] = True
+    get_session(chat_id).playing = True
 
 
 async def music_off(chat_id: int):
-    pause[chat_id] = False
+    get_session(chat_id).playing = False
 
 
 async def get_active_chats() -> list:
-    return active
+    return active_chats()
 
 
 async def is_active_chat(chat_id: int) -> bool:
-    if chat_id not in active:
+    session = find_session(chat_id)
+    if not session:
         return False
-    else:
-        return True
+    return session.active
 
 
 async def add_active_chat(chat_id: int):
-    if chat_id not in active:
-        active.append(chat_id)
+    get_session(chat_id).active = True
 
 
 async def remove_active_chat(chat_id: int):
-    if chat_id in active:
-        active.remove(chat_id)
+    session = find_session(chat_id)
+    if session:
+        session.active = False
 
 
 async def get_active_video_chats() -> list:
-    return activevideo
+    return active_chats(video=True)
 
 
 async def is_active_video_chat(chat_id: int) -> bool:
-    if chat_id not in activevideo:
+    session = find_session(chat_id)
+    if not session:
         return False
-    else:
-        return True
+    return session.video
 
 
 async def add_active_video_chat(chat_id: int):
-    if chat_id not in activevideo:
-        activevideo.append(chat_id)
+    get_session(chat_id).video = True
 
 
 async def remove_active_video_chat(chat_id: int):
-    if chat_id in activevideo:
-        activevideo.remove(chat_id)
+    session = find_session(chat_id)
+    if session:
+        session.video = False
 
 
 async def check_nonadmin_chat(chat_id: int) -> bool:
-    user = await authdb.find_one({"chat_id": chat_id})
-    if not user:
-        return False
-    return True
+    return (await get_settings(chat_id)).nonadmin
 
 
 async def is_nonadmin_chat(chat_id: int) -> bool:
-    mode = nonadmin.get(chat_id)
-    if not mode:
-        user = await authdb.find_one({"chat_id": chat_id})
-        if not user:
-            nonadmin[chat_id] = False
-            return False
-        nonadmin[chat_id] = True
-        return True
-    return mode
+    return (await get_settings(chat_id)).nonadmin
 
 
 async def add_nonadmin_chat(chat_id: int):
-    nonadmin[chat_id] = True
-    is_admin = await check_nonadmin_chat(chat_id)
-    if is_admin:
-        return
-    return await authdb.insert_one({"chat_id": chat_id})
+    await update_settings(chat_id, nonadmin=True)
 
 
 async def remove_nonadmin_chat(chat_id: int):
-    nonadmin[chat_id] = False
-    is_admin = await check_nonadmin_chat(chat_id)
-    if not is_admin:
-        return
-    return await authdb.delete_one({"chat_id": chat_id})
+    await update_settings(chat_id, nonadmin=False)
 
 
+@cached()
 async def is_on_off(on_off: int) -> bool:
     onoff = await onoffdb.find_one({"on_off": on_off})
     if not onoff:
@@ -401,14 +298,16 @@ async def add_on(on_off: int):
     is_on = await is_on_off(on_off)
     if is_on:
         return
-    return await onoffdb.insert_one({"on_off": on_off})
+    await onoffdb.insert_one({"on_off": on_off})
+    is_on_off.invalidate(on_off)
 
 
 async def add_off(on_off: int):
     is_off = await is_on_off(on_off)
     if not is_off:
         return
-    return await onoffdb.delete_one({"on_off": on_off})
+    await onoffdb.delete_one({"on_off": on_off})
+    is_on_off.invalidate(on_off)
 
 
 async def is_maintenance():
@@ -435,7 +334,8 @@ async def maintenance_off():
     is_off = await is_on_off(1)
     if not is_off:
         return
-    return await onoffdb.delete_one({"on_off": 1})
+    await onoffdb.delete_one({"on_off": 1})
+    is_on_off.invalidate(1)
 
 
 async def maintenance_on():
@@ -444,10 +344,28 @@ async def maintenance_on():
     is_on = await is_on_off(1)
     if is_on:
         return
-    return await onoffdb.insert_one({"on_off": 1})
+    await onoffdb.insert_one({"on_off": 1})
+    is_on_off.invalidate(1)
+
+
+async def load_memberships():
+    async def load(collection, query, key, into):
+        async for doc in collection.find(query, {"_id": 0, key: 1}):
+            into.add(doc[key])
+
+    await asyncio.gather(
+        load(usersdb, {"user_id": {"$gt": 0}}, "user_id", served_users),
+        load(chatsdb, {"chat_id": {"$lt": 0}}, "chat_id", served_chats),
+        load(blacklist_chatdb, {"chat_id": {"$lt": 0}}, "chat_id", blacklisted),
+        load(gbansdb, {"user_id": {"$gt": 0}}, "user_id", gbanned),
+        load(blockeddb, {"user_id": {"$gt": 0}}, "user_id", blocked),
+    )
+    loaded.append(True)
 
 
 async def is_served_user(user_id: int) -> bool:
+    if loaded:
+        return user_id in served_users
     user = await usersdb.find_one({"user_id": user_id})
     if not user:
         return False
@@ -456,26 +374,72 @@ async def is_served_user(user_id: int) -> bool:
 
 async def get_served_users() -> list:
     users_list = []
-    async for user in usersdb.find({"user_id": {"$gt": 0}}):
-        users_list.append(user)
+    async for user_id in iter_served_users():
+        users_list.append({"user_id": user_id})
     return users_list
 
 
+async def iter_served_users(batch_size: int = 1000):
+    async for user in usersdb.find(
+        {"user_id": {"$gt": 0}}, {"_id": 0, "user_id": 1}, batch_size=batch_size
+    ):
+        yield user["user_id"]
+
+
+async def get_served_user_ids() -> list:
+    # A snapshot, for long loops that must not hold a cursor open.
+    if loaded:
+        return list(served_users)
+    return [user_id async for user_id in iter_served_users()]
+
+
+async def served_users_count() -> int:
+    if loaded:
+        return len(served_users)
+    return await usersdb.estimated_document_count()
+
+
 async def add_served_user(user_id: int):
-    is_served = await is_served_user(user_id)
-    if is_served:
+    if user_id in served_users:
         return
-    return await usersdb.insert_one({"user_id": user_id})
+    served_users.add(user_id)
+    writer.put(
+        usersdb,
+        UpdateOne(
+            {"user_id": user_id}, {"$setOnInsert": {"user_id": user_id}}, upsert=True
+        ),
+    )
 
 
 async def get_served_chats() -> list:
     chats_list = []
-    async for chat in chatsdb.find({"chat_id": {"$lt": 0}}):
-        chats_list.append(chat)
+    async for chat_id in iter_served_chats():
+        chats_list.append({"chat_id": chat_id})
     return chats_list
 
 
+async def iter_served_chats(batch_size: int = 1000):
+    async for chat in chatsdb.find(
+        {"chat_id": {"$lt": 0}}, {"_id": 0, "chat_id": 1}, batch_size=batch_size
+    ):
+        yield chat["chat_id"]
+
+
+async def get_served_chat_ids() -> list:
+    if loaded:
+        return list(served_chats)
+    return [chat_id async for chat_id in iter_served_chats()]
+
+
+async def served_chats_count() -> int:
+    if loaded:
+        return len(served_chats)
+    return await chatsdb.estimated_document_count()
+
+
 async def is_served_chat(chat_id: int) -> bool:
+    if loaded:
+        return chat_id in served_chats
     chat = await chatsdb.find_one({"chat_id": chat_id})
     if not chat:
         return False
@@ -483,22 +447,39 @@ async def is_served_chat(chat_id: int) -> bool:
 
 
 async def add_served_chat(chat_id: int):
-    is_served = await is_served_chat(chat_id)
-    if is_served:
+    if chat_id in served_chats:
         return
-    return await chatsdb.insert_one({"chat_id": chat_id})
+    served_chats.add(chat_id)
+    writer.put(
+        chatsdb,
+        UpdateOne(
+            {"chat_id": chat_id}, {"$setOnInsert": {"chat_id": chat_id}}, upsert=True
+        ),
+    )
 
 
 async def blacklisted_chats() -> list:
+    if loaded:
+        return list(blacklisted)
     chats_list = []
     async for chat in blacklist_chatdb.find({"chat_id": {"$lt": 0}}):
         chats_list.append(chat["chat_id"])
     return chats_list
 
 
+async def is_blacklisted_chat(chat_id: int) -> bool:
+    if loaded:
+        return chat_id in blacklisted
+    chat = await blacklist_chatdb.find_one({"chat_id": chat_id})
+    if not chat:
+        return False
+    return True
+
+
 async def blacklist_chat(chat_id: int) -> bool:
     if not await blacklist_chatdb.find_one({"chat_id": chat_id}):
         await blacklist_chatdb.insert_one({"chat_id": chat_id})
+        blacklisted.add(chat_id)
         return True
     return False
 
@@ -506,10 +487,12 @@ async def blacklist_chat(chat_id: int) -> bool:
 async def whitelist_chat(chat_id: int) -> bool:
     if await blacklist_chatdb.find_one({"chat_id": chat_id}):
         await blacklist_chatdb.delete_one({"chat_id": chat_id})
+        blacklisted.discard(chat_id)
         return True
     return False
 
 
+@cached()
 async def _get_authusers(chat_id: int) -> Dict[str, int]:
     _notes = await authuserdb.find_one({"chat_id": chat_id})
     if not _notes:
@@ -535,29 +518,33 @@ async def get_authuser(chat_id: int, name: str) -> Union[bool, dict]:
 
 async def save_authuser(chat_id: int, name: str, note: dict):
     name = name
-    _notes = await _get_authusers(chat_id)
-    _notes[name] = note
+    # The getter is cached, so write a copy rather than the cached dict.
+    _notes = {**await _get_authusers(chat_id), name: note}
 
     await authuserdb.update_one(
         {"chat_id": chat_id}, {"$set": {"notes": _notes}}, upsert=True
     )
+    _get_authusers.invalidate(chat_id)
 
 
 async def delete_authuser(chat_id: int, name: str) -> bool:
     notesd = await _get_authusers(chat_id)
     name = name
     if name in notesd:
-        del notesd[name]
+        notesd = {key: value for key, value in notesd.items() if key != name}
         await authuserdb.update_one(
             {"chat_id": chat_id},
             {"$set": {"notes": notesd}},
             upsert=True,
         )
+        _get_authusers.invalidate(chat_id)
         return True
     return False
 
 
 async def get_gbanned() -> list:
+    if loaded:
+        return list(gbanned)
     results = []
     async for user in gbansdb.find({"user_id": {"$gt": 0}}):
         user_id = user["user_id"]
@@ -566,6 +553,8 @@ async def get_gbanned() -> list:
 
 
 async def is_gbanned_user(user_id: int) -> bool:
+    if loaded:
+        return user_id in gbanned
     user = await gbansdb.find_one({"user_id": user_id})
     if not user:
         return False
@@ -576,6 +565,7 @@ async def add_gban_user(user_id: int):
     is_gbanned = await is_gbanned_user(user_id)
     if is_gbanned:
         return
+    gbanned.add(user_id)
     return await gbansdb.insert_one({"user_id": user_id})
 
 
@@ -583,9 +573,11 @@ async def remove_gban_user(user_id: int):
     is_gbanned = await is_gbanned_user(user_id)
     if not is_gbanned:
         return
+    gbanned.discard(user_id)
     return await gbansdb.delete_one({"user_id": user_id})
 
 
+@cached()
 async def get_sudoers() -> list:
     sudoers = await sudoersdb.find_one({"sudo": "sudo"})
     if not sudoers:
@@ -594,24 +586,26 @@ async def get_sudoers() -> list:
 
 
 async def add_sudo(user_id: int) -> bool:
-    sudoers = await get_sudoers()
-    sudoers.append(user_id)
+    sudoers = [*await get_sudoers(), user_id]
     await sudoersdb.update_one(
         {"sudo": "sudo"}, {"$set": {"sudoers": sudoers}}, upsert=True
     )
+    get_sudoers.invalidate()
     return True
 
 
 async def remove_sudo(user_id: int) -> bool:
-    sudoers = await get_sudoers()
-    sudoers.remove(user_id)
+    sudoers = [sudoer for sudoer in await get_sudoers() if sudoer != user_id]
     await sudoersdb.update_one(
         {"sudo": "sudo"}, {"$set": {"sudoers": sudoers}}, upsert=True
     )
+    get_sudoers.invalidate()
     return True
 
 
 async def get_banned_users() -> list:
+    if loaded:
+        return list(blocked)
     results = []
     async for user in blockeddb.find({"user_id": {"$gt": 0}}):
         user_id = user["user_id"]
@@ -620,12 +614,14 @@ async def get_banned_users() -> list:
 
 
 async def get_banned_count() -> int:
-    users = blockeddb.find({"user_id": {"$gt": 0}})
-    users = await users.to_list(length=100000)
-    return len(users)
+    if loaded:
+        return len(blocked)
+    return await blockeddb.count_documents({"user_id": {"$gt": 0}})
 
 
 async def is_banned_user(user_id: int) -> bool:
+    if loaded:
+        return user_id in blocked
     user = await blockeddb.find_one({"user_id": user_id})
     if not user:
         return False
@@ -636,6 +632,7 @@ async def add_banned_user(user_id: int):
     is_gbanned = await is_banned_user(user_id)
     if is_gbanned:
         return
+    blocked.add(user_id)
     return await blockeddb.insert_one({"user_id": user_id})
 
 
@@ -643,4 +640,5 @@ async def remove_banned_user(user_id: int):
     is_gbanned = await is_banned_user(user_id)
     if not is_gbanned:
         return
+    blocked.discard(user_id)
     return await blockeddb.delete_one({"user_id": user_id})
@@ -2,6 +2,7 @@ from pyrogram.enums import ChatType
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from SONALI_MUSIC import app
+from SONALI_MUSIC.core.session import adminlist, confirmer
 from SONALI_MUSIC.misc import SUDOERS, db
 from SONALI_MUSIC.utils.database import (
     get_authuser_names,
@@ -13,7 +14,7 @@ from SONALI_MUSIC.utils.database import (
     is_nonadmin_chat,
     is_skipmode,
 )
-from config import SUPPORT_CHAT, adminlist, confirmer
+from config import SUPPORT_CHAT
 from strings import get_string
 
 from ..formatters import int_to_alpha
@@ -10,6 +10,7 @@ from pyrogram.errors import (
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from SONALI_MUSIC import YouTube, app
+from SONALI_MUSIC.core.session import adminlist, links
 from SONALI_MUSIC.misc import SUDOERS
 from SONALI_MUSIC.utils.database import (
     get_assistant,
@@ -21,11 +22,9 @@ from SONALI_MUSIC.utils.database import (
     is_maintenance,
 )
 from SONALI_MUSIC.utils.inline import botplaylist_markup
-from config import PLAYLIST_IMG_URL, SUPPORT_CHAT, adminlist
+from config import PLAYLIST_IMG_URL, SUPPORT_CHAT
 from strings import get_string
 
-links = {}
-
 
 def PlayWrapper(command):
     async def wrapper(client, message):
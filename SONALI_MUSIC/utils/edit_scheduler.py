@@ -0,0 +1,158 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+from pyrogram.errors import FloodWait, MessageNotModified
+
+from SONALI_MUSIC.logging import LOGGER
+
+EDIT_INTERVAL = 7
+GLOBAL_RATE = 20
+CHAT_RATE = 1 / 3
+MAX_PRESSURE = 8
+MAX_REMEMBERED = 1000
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def ready(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens >= 1
+
+    def take(self) -> bool:
+        if not self.ready():
+            return False
+        self.tokens -= 1
+        return True
+
+
+def _signature(markup) -> tuple:
+    return tuple(
+        tuple((button.text, button.callback_data) for button in row)
+        for row in markup.inline_keyboard
+    )
+
+
+class EditScheduler:
+    """Single loop for every periodic reply-markup edit the bot makes.
+
+    Sources are async callables run once per tick that submit edits. A
+    watch ties a render callable to one message: it returns the markup to
+    show, None to skip this tick, or False to stop watching.
+    """
+
+    def __init__(self):
+        self.sources = []
+        self.watches = {}
+        self.pending = OrderedDict()
+        self.last = OrderedDict()
+        self.buckets = {}
+        self.bucket = TokenBucket(GLOBAL_RATE, GLOBAL_RATE)
+        self.pressure = 1.0
+        self.paused_until = 0
+        self.task = None
+
+    def interval(self) -> float:
+        return EDIT_INTERVAL * self.pressure
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    def add_source(self, source):
+        self.sources.append(source)
+        self.start()
+
+    def watch(self, message, render):
+        self.watches[(message.chat.id, message.id)] = (message, render)
+        self.start()
+
+    def forget(self, key):
+        self.watches.pop(key, None)
+        self.pending.pop(key, None)
+        self.last.pop(key, None)
+
+    def remember(self, key, signature):
+        self.last[key] = signature
+        self.last.move_to_end(key)
+        if len(self.last) > MAX_REMEMBERED:
+            self.last.popitem(last=False)
+
+    def submit(self, message, markup):
+        key = (message.chat.id, message.id)
+        signature = _signature(markup)
+        if self.last.get(key) == signature:
+            self.pending.pop(key, None)
+            return
+        self.pending[key] = (message, markup, signature)
+
+    async def run(self):
+        while not await asyncio.sleep(self.interval()):
+            for source in list(self.sources):
+                try:
+                    await source()
+                except Exception as e:
+                    LOGGER(__name__).warning(f"Edit source failed: {e}")
+            for key, (message, render) in list(self.watches.items()):
+                try:
+                    markup = await render()
+                except:
+                    markup = False
+                if markup is False:
+                    self.forget(key)
+                elif markup is not None:
+                    self.submit(message, markup)
+            await self.drain()
+
+    async def drain(self):
+        if time.monotonic() < self.paused_until:
+            return
+        flooded = False
+        for key in list(self.pending):
+            chat_bucket = self.buckets.get(key[0])
+            if not chat_bucket:
+                chat_bucket = self.buckets[key[0]] = TokenBucket(CHAT_RATE, 1)
+            # Check both before taking either, so a chat keeps its token when
+            # the global budget runs out.
+            if not chat_bucket.ready():
+                continue
+            if not self.bucket.ready():
+                break
+            chat_bucket.take()
+            self.bucket.take()
+            message, markup, signature = self.pending.pop(key)
+            try:
+                await message.edit_reply_markup(reply_markup=markup)
+                self.remember(key, signature)
+            except MessageNotModified:
+                self.remember(key, signature)
+            except FloodWait as e:
+                self.pending[key] = (message, markup, signature)
+                self.paused_until = time.monotonic() + int(e.value)
+                self.pressure = min(self.pressure * 2, MAX_PRESSURE)
+                flooded = True
+                LOGGER(__name__).warning(
+                    f"FloodWait of {e.value}s on edits, interval now {self.interval()}s."
+                )
+                break
+            except:
+                self.forget(key)
+        if not flooded:
+            self.pressure = max(1.0, self.pressure * 0.9)
+        now = time.monotonic()
+        for chat_id, bucket in list(self.buckets.items()):
+            # Kept for at least one tick, or every tick would get a full bucket.
+            if now - bucket.updated > max(bucket.capacity / bucket.rate, self.interval()) * 2:
+                del self.buckets[chat_id]
+
+
+editor = EditScheduler()
@@ -0,0 +1,192 @@
+import asyncio
+import bisect
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import yt_dlp
+
+import config
+from SONALI_MUSIC.logging import LOGGER
+from SONALI_MUSIC.utils.cookies import cookies
+
+BUCKETS = (0.25, 0.5, 1, 2, 5, 10)
+BASE_OPTIONS = {
+    "quiet": True,
+    "no_warnings": True,
+    "geo_bypass": True,
+    "nocheckcertificate": True,
+}
+
+
+class LatencyHistogram:
+    __slots__ = ("counts", "samples")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.samples = deque(maxlen=200)
+
+    def add(self, seconds: float):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.samples.append(seconds)
+
+    def stats(self) -> dict:
+        ordered = sorted(self.samples)
+        labels = [f"<{bound}s" for bound in BUCKETS] + [f">{BUCKETS[-1]}s"]
+        return {
+            "count": sum(self.counts),
+            "p50": round(ordered[len(ordered) // 2] * 1000) if ordered else 0,
+            "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000)
+            if ordered
+            else 0,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class ExtractorPool:
+    """Long-lived YoutubeDL instances working in a bounded thread pool.
+
+    YoutubeDL is not thread safe, so each worker thread keeps its own
+    instance per option set, rebuilt when its cookie file changes. When
+    the in-process call fails the yt-dlp CLI is tried as before, with a
+    freshly picked cookie file, and both paths are timed separately.
+    """
+
+    def __init__(self, workers: int):
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="ytdlp")
+        self.local = threading.local()
+        self.histograms = {}
+
+    def _client(self, options: dict):
+        clients = getattr(self.local, "clients", None)
+        if clients is None:
+            clients = self.local.clients = {}
+        key = tuple(sorted(options.items()))
+        # YoutubeDL reads its cookie file once, so a rewritten file needs a new client.
+        cookie = cookies.files.get(options.get("cookiefile"))
+        version = cookie.mtime if cookie else None
+        client = clients.get(key)
+        if client is None or client[0] != version:
+            client = clients[key] = (version, yt_dlp.YoutubeDL({**BASE_OPTIONS, **options}))
+        return client[1]
+
+    def _extract(self, link: str, options: dict):
+        return self._client(options).extract_info(link, download=False)
+
+    def record(self, op: str, path: str, started: float):
+        histogram = self.histograms.get((op, path))
+        if histogram is None:
+            histogram = self.histograms[(op, path)] = LatencyHistogram()
+        histogram.add(time.monotonic() - started)
+
+    async def extract(self, op: str, link: str, options: dict):
+        options = {key: value for key, value in options.items() if value is not None}
+        started = time.monotonic()
+        try:
+            info = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self._extract, link, options
+            )
+        except Exception as e:
+            cookies.report(options.get("cookiefile"), False, error=e)
+            raise
+        self.record(op, "pool", started)
+        cookies.report(options.get("cookiefile"), True, time.monotonic() - started)
+        return info
+
+    async def cli(self, op: str, link: str, cookiefile: str = None, *args):
+        started = time.monotonic()
+        command = ["yt-dlp"]
+        if cookiefile:
+            command += ["--cookies", cookiefile]
+        proc = await asyncio.create_subprocess_exec(
+            *command,
+            *args,
+            link,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await proc.communicate()
+        self.record(op, "cli", started)
+        cookies.report(
+            cookiefile,
+            proc.returncode == 0,
+            time.monotonic() - started,
+            error=stderr.decode(),
+        )
+        return proc.returncode, stdout.decode(), stderr.decode()
+
+    async def get_stream_url(self, link: str, format: str, cookiefile: str = None) -> str:
+        try:
+            info = await self.extract(
+                "stream_url", link, {"format": format, "cookiefile": cookiefile}
+            )
+            if info.get("url"):
+                return info["url"]
+            return info["requested_formats"][0]["url"]
+        except Exception as e:
+            LOGGER(__name__).warning(f"In-process stream lookup failed for {link}: {e}")
+        code, stdout, stderr = await self.cli(
+            "stream_url", link, cookiefile and cookies.pick(), "-g", "-f", format
+        )
+        if stdout:
+            return stdout.split("\n")[0]
+        raise ValueError(stderr)
+
+    async def get_formats(self, link: str, cookiefile: str = None) -> dict:
+        try:
+            return await self.extract("formats", link, {"cookiefile": cookiefile})
+        except Exception as e:
+            LOGGER(__name__).warning(f"In-process format lookup failed for {link}: {e}")
+        code, stdout, stderr = await self.cli(
+            "formats", link, cookiefile and cookies.pick(), "-J"
+        )
+        if code != 0:
+            raise ValueError(stderr)
+        return json.loads(stdout)
+
+    async def flat_playlist(self, link: str, limit: int, cookiefile: str = None) -> list:
+        try:
+            info = await self.extract(
+                "playlist",
+                link,
+                {
+                    "extract_flat": "in_playlist",
+                    "playlistend": int(limit),
+                    "ignoreerrors": True,
+                    "cookiefile": cookiefile,
+                },
+            )
+            return [entry["id"] for entry in info.get("entries") or [] if entry]
+        except Exception as e:
+            LOGGER(__name__).warning(f"In-process playlist lookup failed for {link}: {e}")
+        code, stdout, stderr = await self.cli(
+            "playlist",
+            link,
+            cookiefile and cookies.pick(),
+            "-i",
+            "--get-id",
+            "--flat-playlist",
+            "--playlist-end",
+            str(limit),
+            "--skip-download",
+        )
+        return [key for key in stdout.split("\n") if key]
+
+    def stats(self) -> dict:
+        merged = {}
+        for (op, path), histogram in self.histograms.items():
+            merged.setdefault(path, []).extend(histogram.samples)
+        summary = {}
+        for path in ("pool", "cli"):
+            ordered = sorted(merged.get(path, ()))
+            summary[path] = round(ordered[len(ordered) // 2] * 1000) if ordered else 0
+        summary["ops"] = {
+            f"{op}/{path}": histogram.stats()
+            for (op, path), histogram in self.histograms.items()
+        }
+        return summary
+
+
+extractor = ExtractorPool(config.YTDLP_WORKERS)
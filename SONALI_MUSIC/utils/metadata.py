@@ -0,0 +1,34 @@
+from youtubesearchpython.__future__ import VideosSearch
+
+from SONALI_MUSIC.utils.cache import cached
+
+BASE = "https://www.youtube.com/watch?v="
+
+
+def clean_link(link: str) -> str:
+    if "&" in link:
+        link = link.split("&")[0]
+    return link
+
+
+def thumbnail_url(result: dict) -> str:
+    return result["thumbnails"][0]["url"].split("?")[0]
+
+
+@cached(ttl=3600, maxsize=2048)
+async def search(query: str, limit: int) -> list:
+    """One YouTube search shared by every caller asking the same thing.
+
+    Each video found is also cached under its watch link, so a later
+    lookup by id (the thumbnail card, a slider pick) is not searched again.
+    """
+    results = (await VideosSearch(query, limit=limit).next()).get("result")
+    if not results:
+        raise ValueError(f"No YouTube results for {query}")
+    for result in results:
+        search.set([result], BASE + result["id"], 1)
+    return results
+
+
+async def video_info(link: str) -> dict:
+    return (await search(clean_link(link), 1))[0]
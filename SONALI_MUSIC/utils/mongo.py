@@ -21,11 +21,9 @@
 
 from typing import Dict, Union
 
-from motor.motor_asyncio import AsyncIOMotorClient as MongoCli
+from SONALI_MUSIC.core.mongo import mongo_client
 
-from config import MONGO_DB_URI
-
-mongo = MongoCli(MONGO_DB_URI)
+mongo = mongo_client()
 db = mongo.SONALI_MUSIC
 
 coupledb = db.couple
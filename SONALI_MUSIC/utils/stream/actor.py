@@ -0,0 +1,84 @@
+import asyncio
+import time
+from collections import deque
+
+IDLE_TIMEOUT = 300
+
+actors = {}
+waits = deque(maxlen=500)
+
+
+class PlaybackActor:
+    """Owns one chat's playback state by running its commands one by one."""
+
+    __slots__ = ("chat_id", "inbox", "task")
+
+    def __init__(self, chat_id: int):
+        self.chat_id = chat_id
+        self.inbox = asyncio.Queue()
+        self.task = asyncio.create_task(self.run())
+
+    async def run(self):
+        future = None
+        try:
+            while True:
+                try:
+                    command = await asyncio.wait_for(self.inbox.get(), IDLE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    if self.inbox.empty():
+                        if actors.get(self.chat_id) is self:
+                            actors.pop(self.chat_id)
+                        return
+                    continue
+                enqueued, func, args, kwargs, future = command
+                waits.append(time.monotonic() - enqueued)
+                if future.done():
+                    continue
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+        except asyncio.CancelledError:
+            # Nobody will run what is still queued, so release every waiter.
+            if actors.get(self.chat_id) is self:
+                actors.pop(self.chat_id)
+            waiting = [future] if future else []
+            while not self.inbox.empty():
+                waiting.append(self.inbox.get_nowait()[-1])
+            for pending in waiting:
+                if not pending.done():
+                    pending.set_exception(RuntimeError(f"Playback actor of {self.chat_id} stopped"))
+            raise
+
+
+async def dispatch(chat_id: int, func, *args, **kwargs):
+    actor = actors.get(chat_id)
+    if actor and actor.task is asyncio.current_task():
+        return await func(*args, **kwargs)
+    if not actor or actor.task.done():
+        actor = actors[chat_id] = PlaybackActor(chat_id)
+    future = asyncio.get_running_loop().create_future()
+    actor.inbox.put_nowait((time.monotonic(), func, args, kwargs, future))
+    return await future
+
+
+def inbox_stats() -> dict:
+    ordered = sorted(waits)
+    if not ordered:
+        p50 = p95 = worst = 0.0
+    else:
+        p50 = ordered[len(ordered) // 2]
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        worst = ordered[-1]
+    return {
+        "actors": len(actors),
+        "queued": sum(actor.inbox.qsize() for actor in actors.values()),
+        "p50": round(p50 * 1000, 2),
+        "p95": round(p95 * 1000, 2),
+        "max": round(worst * 1000, 2),
+    }
+
@@ -1,6 +1,8 @@
 import os
 
 from config import autoclean
+from SONALI_MUSIC.utils.stream.mediacache import media
+from SONALI_MUSIC.utils.stream.speed import drop_rendered
 
 
 async def auto_clean(popped):
@@ -9,10 +11,13 @@ async def auto_clean(popped):
         autoclean.remove(rem)
         count = autoclean.count(rem)
         if count == 0:
-            if "vid_" not in rem or "live_" not in rem or "index_" not in rem:
+            if media.owns(rem):
+                media.trim()
+            elif "vid_" not in rem or "live_" not in rem or "index_" not in rem:
                 try:
                     os.remove(rem)
                 except:
                     pass
+                drop_rendered(rem)
     except:
         pass
@@ -0,0 +1,64 @@
+import time
+
+from SONALI_MUSIC.misc import db
+
+clocks = {}
+
+
+class PlaybackClock:
+    __slots__ = ("offset", "speed", "started", "paused", "paused_at")
+
+    def __init__(self, offset: int = 0, speed: float = 1.0):
+        self.offset = offset
+        self.speed = speed
+        self.started = time.monotonic()
+        self.paused = 0.0
+        self.paused_at = None
+
+    def elapsed(self) -> float:
+        now = self.paused_at if self.paused_at is not None else time.monotonic()
+        return self.offset + (now - self.started - self.paused) * self.speed
+
+    def pause(self):
+        if self.paused_at is None:
+            self.paused_at = time.monotonic()
+
+    def resume(self):
+        if self.paused_at is not None:
+            self.paused += time.monotonic() - self.paused_at
+            self.paused_at = None
+
+
+def start_clock(chat_id: int, offset: int = 0, speed: float = 1.0):
+    clocks[chat_id] = PlaybackClock(offset, float(speed))
+
+
+def pause_clock(chat_id: int):
+    clock = clocks.get(chat_id)
+    if clock:
+        clock.pause()
+
+
+def resume_clock(chat_id: int):
+    clock = clocks.get(chat_id)
+    if clock:
+        clock.resume()
+
+
+def stop_clock(chat_id: int):
+    clocks.pop(chat_id, None)
+
+
+def get_played(chat_id: int) -> int:
+    playing = db.get(chat_id)
+    if not playing:
+        return 0
+    clock = clocks.get(chat_id)
+    if not clock:
+        return int(playing[0].get("played", 0))
+    played = int(clock.elapsed())
+    duration = int(playing[0]["seconds"])
+    if duration and played > duration:
+        played = duration
+    playing[0]["played"] = played
+    return played
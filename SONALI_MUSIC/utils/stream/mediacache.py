@@ -0,0 +1,193 @@
+import asyncio
+import os
+import re
+import time
+from collections import OrderedDict
+
+import config
+from SONALI_MUSIC.logging import LOGGER
+from SONALI_MUSIC.misc import db
+from SONALI_MUSIC.utils.cache import SingleFlight
+from SONALI_MUSIC.utils.stream.speed import drop_rendered
+
+FOLDER = "downloads"
+EVICT_WINDOW = 8
+GRACE = 900
+YOUTUBE_ID = re.compile(r"^[\w-]{11}$")
+
+
+class MediaEntry:
+    __slots__ = ("path", "size", "hits", "used", "queued")
+
+    def __init__(self, path: str, size: int, used: float = None, queued: bool = True):
+        self.path = path
+        self.size = size
+        self.hits = 0
+        self.used = used or time.time()
+        self.queued = queued
+
+    def evictable(self, now: float) -> bool:
+        # A file just handed out is kept until it reached a queue, or for
+        # GRACE seconds if it never does.
+        return self.queued or now - self.used > GRACE
+
+
+class MediaCache:
+    """Downloaded media keyed by (source, id, format) under a disk budget.
+
+    Eviction looks at the EVICT_WINDOW least recently used files that no
+    queue is holding and removes the one with the fewest hits. A file is
+    never evicted before it was first played.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.entries = OrderedDict()
+        self.paths = {}
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self.saved = 0
+        self.evicted = 0
+        self.joined = 0
+        self.inflight = SingleFlight()
+        self.scanned = False
+
+    def scan(self):
+        self.scanned = True
+        if not os.path.isdir(FOLDER):
+            return
+        found = []
+        for name in os.listdir(FOLDER):
+            media_id, ext = os.path.splitext(name)
+            path = os.path.join(FOLDER, name)
+            if name.startswith("."):
+                # Leftover of a download that never got renamed into place.
+                try:
+                    if time.time() - os.path.getmtime(path) > 3600:
+                        os.remove(path)
+                except:
+                    pass
+                continue
+            if not YOUTUBE_ID.match(media_id) or not os.path.isfile(path):
+                continue
+            form = "video" if ext == ".mp4" else "audio"
+            found.append((os.path.getmtime(path), ("youtube", media_id, form), path))
+        for used, key, path in sorted(found):
+            self._store(key, MediaEntry(path, os.path.getsize(path), used))
+        if found:
+            LOGGER(__name__).info(f"Media cache adopted {len(found)} downloaded files.")
+        self.trim()
+
+    def _store(self, key, entry: MediaEntry):
+        self._drop(key)
+        self.entries[key] = entry
+        self.paths[entry.path] = key
+        self.used += entry.size
+
+    def _drop(self, key):
+        entry = self.entries.pop(key, None)
+        if entry:
+            self.paths.pop(entry.path, None)
+            self.used -= entry.size
+        return entry
+
+    def get(self, source: str, media_id: str, form: str):
+        if not self.scanned:
+            self.scan()
+        key = (source, str(media_id), form)
+        entry = self.entries.get(key)
+        if entry and not os.path.isfile(entry.path):
+            self._drop(key)
+            entry = None
+        if not entry:
+            self.misses += 1
+            return None
+        entry.hits += 1
+        entry.used = time.time()
+        entry.queued = False
+        self.entries.move_to_end(key)
+        self.hits += 1
+        self.saved += entry.size
+        return entry.path
+
+    def add(self, source: str, media_id: str, form: str, path: str):
+        if not self.scanned:
+            self.scan()
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        key = (source, str(media_id), form)
+        self._store(key, MediaEntry(path, size, queued=False))
+        self.trim(keep=key)
+
+    async def download(self, source: str, media_id: str, form: str, fetch):
+        """Run fetch() once per key; concurrent requesters await the same result."""
+        key = (source, str(media_id), form)
+        task, started = self.inflight.start(key, fetch)
+        if not started:
+            self.joined += 1
+        return await asyncio.shield(task)
+
+    def owns(self, path) -> bool:
+        return path in self.paths
+
+    def pinned(self) -> set:
+        held = set(config.autoclean)
+        for queue in db.values():
+            for entry in queue:
+                held.add(entry.get("file"))
+                if "vid_" in str(entry.get("file")):
+                    held.update(
+                        self.entries[key].path
+                        for key in (
+                            ("youtube", entry.get("vidid"), "audio"),
+                            ("youtube", entry.get("vidid"), "video"),
+                        )
+                        if key in self.entries
+                    )
+        return held
+
+    def trim(self, keep=None):
+        if self.used <= self.limit:
+            return
+        held = self.pinned()
+        now = time.time()
+        for entry in self.entries.values():
+            if entry.path in held:
+                entry.queued = True
+        while self.used > self.limit:
+            window = []
+            for key, entry in self.entries.items():
+                if key != keep and entry.path not in held and entry.evictable(now):
+                    window.append(key)
+                    if len(window) >= EVICT_WINDOW:
+                        break
+            if not window:
+                return
+            victim = min(window, key=lambda key: self.entries[key].hits)
+            entry = self._drop(victim)
+            try:
+                os.remove(entry.path)
+            except:
+                pass
+            drop_rendered(entry.path)
+            self.evicted += 1
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "files": len(self.entries),
+            "used": self.used,
+            "limit": self.limit,
+            "hits": self.hits,
+            "misses": self.misses,
+            "ratio": round(self.hits / total * 100, 1) if total else 0.0,
+            "saved": self.saved,
+            "evicted": self.evicted,
+            "joined": self.joined,
+        }
+
+
+media = MediaCache(config.MEDIA_CACHE_LIMIT * 1024 * 1024)
@@ -0,0 +1,69 @@
+import asyncio
+
+from SONALI_MUSIC import YouTube
+from SONALI_MUSIC.logging import LOGGER
+from SONALI_MUSIC.misc import db
+from SONALI_MUSIC.utils.thumbnails import get_thumb
+
+prefetched = {}
+
+
+def _key(entry: dict) -> tuple:
+    return entry["file"], entry["vidid"], entry["streamtype"]
+
+
+async def _resolve(entry: dict) -> dict:
+    queued = entry["file"]
+    videoid = entry["vidid"]
+    video = True if str(entry["streamtype"]) == "video" else False
+    resolved = {"link": None, "thumb": None}
+    if "live_" in queued:
+        n, link = await YouTube.video(videoid, True)
+        if n == 0:
+            raise ValueError(link)
+        resolved["link"] = link
+        resolved["thumb"] = await get_thumb(videoid)
+    elif "vid_" in queued:
+        file_path, direct = await YouTube.download(
+            videoid,
+            None,
+            videoid=True,
+            video=video,
+        )
+        resolved["link"] = file_path
+        resolved["thumb"] = await get_thumb(videoid)
+    elif "index_" not in queued and videoid not in ["telegram", "soundcloud"]:
+        resolved["thumb"] = await get_thumb(videoid)
+    return resolved
+
+
+def cancel_prefetch(chat_id: int):
+    current = prefetched.pop(chat_id, None)
+    if current and not current[1].done():
+        current[1].cancel()
+
+
+def schedule_prefetch(chat_id: int):
+    check = db.get(chat_id)
+    if not check or len(check) < 2:
+        return cancel_prefetch(chat_id)
+    key = _key(check[1])
+    current = prefetched.get(chat_id)
+    if current and current[0] == key:
+        return
+    cancel_prefetch(chat_id)
+    prefetched[chat_id] = (key, asyncio.create_task(_resolve(check[1])))
+
+
+async def take_prefetch(chat_id: int, entry: dict):
+    current = prefetched.get(chat_id)
+    if not current or current[0] != _key(entry):
+        return None
+    task = prefetched.pop(chat_id)[1]
+    try:
+        return await task
+    except asyncio.CancelledError:
+        return None
+    except Exception as e:
+        LOGGER(__name__).warning(f"Prefetch failed for {chat_id}: {e}")
+        return None
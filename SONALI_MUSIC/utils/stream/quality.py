@@ -0,0 +1,86 @@
+import os
+import time
+
+import psutil
+from pytgcalls.types.input_stream.quality import (
+    HighQualityAudio,
+    LowQualityAudio,
+    LowQualityVideo,
+    MediumQualityAudio,
+    MediumQualityVideo,
+)
+
+import config
+from SONALI_MUSIC.core.session import active_chats
+from SONALI_MUSIC.logging import LOGGER
+
+PROFILES = [
+    ("high", HighQualityAudio, MediumQualityVideo),
+    ("medium", MediumQualityAudio, LowQualityVideo),
+    ("low", LowQualityAudio, LowQualityVideo),
+]
+AUDIO_COST = 1
+VIDEO_COST = 4
+DOWNGRADE_AT = 0.85
+UPGRADE_AT = 0.5
+
+
+class QualityGovernor:
+    """Picks the ffmpeg quality profile from CPU usage and call counts."""
+
+    def __init__(self):
+        self.level = 0
+        self.cpu = 0.0
+        self.pressure = 0.0
+        self.changed = time.time()
+        self.reason = "startup"
+        self.capacity = (os.cpu_count() or 1) * config.CALLS_PER_CORE
+
+    @property
+    def name(self) -> str:
+        return PROFILES[self.level][0]
+
+    def audio(self):
+        return PROFILES[self.level][1]()
+
+    def video(self):
+        return PROFILES[self.level][2]()
+
+    def update(self) -> bool:
+        self.cpu = psutil.cpu_percent(interval=None)
+        active = len(active_chats())
+        video = len(active_chats(video=True))
+        calls = (active - video) * AUDIO_COST + video * VIDEO_COST
+        self.pressure = max(self.cpu / 100, calls / self.capacity)
+        if self.pressure >= DOWNGRADE_AT and self.level < len(PROFILES) - 1:
+            self.level += 1
+        elif self.pressure <= UPGRADE_AT and self.level > 0:
+            self.level -= 1
+        else:
+            return False
+        self.changed = time.time()
+        self.reason = (
+            f"cpu {self.cpu}%, {active} calls ({video} video)"
+        )
+        LOGGER(__name__).info(f"Stream quality set to {self.name}: {self.reason}.")
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "profile": self.name,
+            "cpu": self.cpu,
+            "pressure": round(self.pressure * 100),
+            "reason": self.reason,
+            "since": int(time.time() - self.changed),
+        }
+
+
+governor = QualityGovernor()
+
+
+def audio_quality():
+    return governor.audio()
+
+
+def video_quality():
+    return governor.video()
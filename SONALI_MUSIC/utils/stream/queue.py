@@ -3,6 +3,7 @@ from typing import Union
 
 from SONALI_MUSIC.misc import db
 from SONALI_MUSIC.utils.formatters import check_duration, seconds_to_min
+from SONALI_MUSIC.utils.stream.prefetch import schedule_prefetch
 from config import autoclean, time_to_seconds
 
 
@@ -45,6 +46,7 @@ async def put_queue(
     else:
         db[chat_id].append(put)
     autoclean.append(file)
+    schedule_prefetch(chat_id)
 
 
 async def put_queue_index(
@@ -89,3 +91,4 @@ async def put_queue_index(
             db[chat_id].append(put)
     else:
         db[chat_id].append(put)
+    schedule_prefetch(chat_id)
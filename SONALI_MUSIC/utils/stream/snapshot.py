@@ -0,0 +1,121 @@
+import asyncio
+import os
+
+from config import autoclean
+from SONALI_MUSIC.core.mongo import mongodb
+from SONALI_MUSIC.logging import LOGGER
+from SONALI_MUSIC.misc import db
+from SONALI_MUSIC.utils.stream.clock import get_played
+
+queuesdb = mongodb.queues
+
+SNAPSHOT_INTERVAL = 30
+SNAPSHOT_KEYS = (
+    "title",
+    "dur",
+    "streamtype",
+    "by",
+    "user_id",
+    "chat_id",
+    "file",
+    "vidid",
+    "seconds",
+    "speed",
+)
+
+# chat_id -> (entries, played) as last written, so a tick only sends what changed.
+saved = {}
+task = None
+
+
+def compact(entry: dict) -> dict:
+    entry = dict(entry)
+    if entry.get("speed_path"):
+        # Rendered speed files are wiped on boot, fall back to the original.
+        entry["dur"] = entry.get("old_dur", entry["dur"])
+        entry["seconds"] = entry.get("old_second", entry["seconds"])
+        entry["speed"] = 1.0
+    return {key: entry[key] for key in SNAPSHOT_KEYS if entry.get(key) is not None}
+
+
+def head_offset(entry: dict, played: int) -> int:
+    # The offset into the original file, since compact() drops the speed render.
+    if entry.get("speed_path"):
+        return int(played * float(entry.get("speed") or 1.0))
+    return played
+
+
+async def snapshot_queues():
+    for chat_id, queue in list(db.items()):
+        if not queue:
+            continue
+        try:
+            entries = [compact(entry) for entry in queue]
+            played = head_offset(queue[0], get_played(chat_id))
+        except:
+            continue
+        last = saved.get(chat_id)
+        if last and last[0] == entries:
+            if last[1] == played:
+                continue
+            update = {"$set": {"played": played}}
+        else:
+            update = {"$set": {"queue": entries, "played": played}}
+        try:
+            await queuesdb.update_one({"chat_id": chat_id}, update, upsert=True)
+            saved[chat_id] = (entries, played)
+        except Exception as e:
+            LOGGER(__name__).warning(f"Queue snapshot of {chat_id} failed: {e}")
+    for chat_id in list(saved):
+        if db.get(chat_id):
+            continue
+        try:
+            await queuesdb.delete_one({"chat_id": chat_id})
+            saved.pop(chat_id, None)
+        except:
+            pass
+
+
+async def snapshot_loop():
+    while not await asyncio.sleep(SNAPSHOT_INTERVAL):
+        await snapshot_queues()
+
+
+def start_snapshots():
+    global task
+    if task is None or task.done():
+        task = asyncio.create_task(snapshot_loop())
+
+
+async def load_snapshots() -> list:
+    restored = []
+    async for snapshot in queuesdb.find({}):
+        chat_id = snapshot["chat_id"]
+        queue = snapshot.get("queue") or []
+        if not queue or db.get(chat_id):
+            continue
+        head = queue[0]
+        # Older snapshots kept the offset inside the head entry.
+        played = int(snapshot.get("played", head.get("played", 0)))
+        if (
+            not os.path.exists(head["file"])
+            and head["file"].split("_", 1)[0] not in ["vid", "live", "index"]
+            and head["vidid"] not in ["telegram", "soundcloud"]
+        ):
+            head["file"] = f"vid_{head['vidid']}"
+        for entry in queue:
+            entry["played"] = 0
+            autoclean.append(entry["file"])
+        head["played"] = played
+        db[chat_id] = queue
+        saved[chat_id] = ([compact(entry) for entry in queue], played)
+        restored.append(chat_id)
+    return restored
+
+
+async def drop_snapshot(chat_id: int):
+    saved.pop(chat_id, None)
+    try:
+        await queuesdb.delete_one({"chat_id": chat_id})
+    except:
+        pass
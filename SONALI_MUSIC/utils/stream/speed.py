@@ -0,0 +1,78 @@
+import os
+from collections import OrderedDict
+
+import config
+from SONALI_MUSIC.misc import db
+
+rendered = OrderedDict()
+
+
+def tempo_parameters(speed) -> str:
+    if str(speed) == str("1.0"):
+        return ""
+    return f" -atmid -filter:a atempo={speed}"
+
+
+def live_speed(entry: dict) -> float:
+    if entry.get("speed_path"):
+        return 1.0
+    return float(entry.get("speed") or 1.0)
+
+
+def render_path(file_path, speed) -> str:
+    chatdir = os.path.join(os.getcwd(), "playback", str(speed))
+    if not os.path.isdir(chatdir):
+        os.makedirs(chatdir)
+    return os.path.join(chatdir, os.path.basename(file_path))
+
+
+def _in_use(out) -> bool:
+    for queue in db.values():
+        for entry in queue:
+            if entry.get("speed_path") == out:
+                return True
+    return False
+
+
+def _remove(key):
+    out = rendered.pop(key, None)
+    if out:
+        try:
+            os.remove(out)
+        except:
+            pass
+
+
+def get_rendered(file_path, speed):
+    key = (str(file_path), str(speed))
+    out = rendered.get(key)
+    if not out:
+        return None
+    if not os.path.isfile(out):
+        rendered.pop(key, None)
+        return None
+    rendered.move_to_end(key)
+    return out
+
+
+def add_rendered(file_path, speed, out):
+    rendered[(str(file_path), str(speed))] = out
+    rendered.move_to_end((str(file_path), str(speed)))
+    limit = config.SPEED_CACHE_LIMIT * 1024 * 1024
+    total = sum(os.path.getsize(x) for x in rendered.values() if os.path.isfile(x))
+    for key in list(rendered):
+        if total <= limit:
+            break
+        if _in_use(rendered[key]):
+            continue
+        try:
+            total -= os.path.getsize(rendered[key])
+        except:
+            pass
+        _remove(key)
+
+
+def drop_rendered(file_path):
+    for key in list(rendered):
+        if key[0] == str(file_path) and not _in_use(rendered[key]):
+            _remove(key)
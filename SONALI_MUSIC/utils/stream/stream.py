@@ -12,10 +12,47 @@ from SONALI_MUSIC.utils.database import add_active_video_chat, is_active_chat
 from SONALI_MUSIC.utils.exceptions import AssistantErr
 from SONALI_MUSIC.utils.inline import aq_markup, close_markup, stream_markup
 from SONALI_MUSIC.utils.pastebin import SonaBin
+from SONALI_MUSIC.utils.stream.actor import dispatch
 from SONALI_MUSIC.utils.stream.queue import put_queue, put_queue_index
 from SONALI_MUSIC.utils.thumbnails import get_thumb
 
 
+async def play_or_queue(chat_id, enqueue, join, fetch=None, forceplay=None):
+    """Start the call with join() when the chat is idle, else queue behind it.
+
+    Only this step runs in the chat's actor, so a slow search or download
+    never holds up a skip or a stream end. fetch() is awaited beforehand
+    whenever the track may have to start playing. Returns the queue
+    position, 0 when it started, and the queue entry.
+    """
+    fetched = fetch is None
+    if not fetched and (forceplay or not await is_active_chat(chat_id)):
+        await fetch()
+        fetched = True
+
+    async def apply():
+        if forceplay:
+            await Sona.force_stop_stream(chat_id)
+        elif await is_active_chat(chat_id):
+            await enqueue()
+            return len(db.get(chat_id)) - 1, db[chat_id][-1]
+        elif not fetched:
+            return None
+        else:
+            db[chat_id] = []
+        await join()
+        await enqueue(forceplay)
+        return 0, db[chat_id][0]
+
+    played = await dispatch(chat_id, apply)
+    if played is None:
+        # The chat went idle after we decided to only queue the track.
+        await fetch()
+        fetched = True
+        played = await dispatch(chat_id, apply)
+    return played
+
+
 async def stream(
     _,
     mystic,
@@ -31,8 +68,6 @@ async def stream(
 ):
     if not result:
         return
-    if forceplay:
-        await Sona.force_stop_stream(chat_id)
     if streamtype == "playlist":
         msg = f"{_['play_19']}\n\n"
         count = 0
@@ -53,32 +88,19 @@ async def stream(
                 continue
             if duration_sec > config.DURATION_LIMIT:
                 continue
-            if await is_active_chat(chat_id):
-                await put_queue(
-                    chat_id,
-                    original_chat_id,
-                    f"vid_{vidid}",
-                    title,
-                    duration_min,
-                    user_name,
-                    vidid,
-                    user_id,
-                    "video" if video else "audio",
-                )
-                position = len(db.get(chat_id)) - 1
-                count += 1
-                msg += f"{count}. {title[:70]}\n"
-                msg += f"{_['play_20']} {position}\n\n"
-            else:
-                if not forceplay:
-                    db[chat_id] = []
-                status = True if video else None
+            status = True if video else None
+            file_path = direct = None
+
+            async def fetch():
+                nonlocal file_path, direct
                 try:
                     file_path, direct = await YouTube.download(
                         vidid, mystic, video=status, videoid=True
                     )
                 except:
                     raise AssistantErr(_["play_14"])
+
+            async def join():
                 await Sona.join_call(
                     chat_id,
                     original_chat_id,
@@ -86,6 +108,8 @@ async def stream(
                     video=status,
                     image=thumbnail,
                 )
+
+            async def enqueue(forceplay=None):
                 await put_queue(
                     chat_id,
                     original_chat_id,
@@ -98,21 +122,31 @@ async def stream(
                     "video" if video else "audio",
                     forceplay=forceplay,
                 )
-                img = await get_thumb(vidid)
-                button = stream_markup(_, chat_id)
-                run = await app.send_photo(
-                    original_chat_id,
-                    photo=img,
-                    caption=_["stream_1"].format(
-                        f"https://t.me/{app.username}?start=info_{vidid}",
-                        title[:23],
-                        duration_min,
-                        user_name,
-                    ),
-                    reply_markup=InlineKeyboardMarkup(button),
-                )
-                db[chat_id][0]["mystic"] = run
-                db[chat_id][0]["markup"] = "stream"
+
+            position, entry = await play_or_queue(
+                chat_id, enqueue, join, fetch, forceplay
+            )
+            if position:
+                count += 1
+                msg += f"{count}. {title[:70]}\n"
+                msg += f"{_['play_20']} {position}\n\n"
+                continue
+            forceplay = None
+            img = await get_thumb(vidid)
+            button = stream_markup(_, chat_id)
+            run = await app.send_photo(
+                original_chat_id,
+                photo=img,
+                caption=_["stream_1"].format(
+                    f"https://t.me/{app.username}?start=info_{vidid}",
+                    title[:23],
+                    duration_min,
+                    user_name,
+                ),
+                reply_markup=InlineKeyboardMarkup(button),
+            )
+            entry["mystic"] = run
+            entry["markup"] = "stream"
         if count == 0:
             return
         else:
@@ -143,28 +177,8 @@ async def stream(
             )
         except:
             raise AssistantErr(_["play_14"])
-        if await is_active_chat(chat_id):
-            await put_queue(
-                chat_id,
-                original_chat_id,
-                file_path if direct else f"vid_{vidid}",
-                title,
-                duration_min,
-                user_name,
-                vidid,
-                user_id,
-                "video" if video else "audio",
-            )
-            position = len(db.get(chat_id)) - 1
-            button = aq_markup(_, chat_id)
-            await app.send_message(
-                chat_id=original_chat_id,
-                text=_["queue_4"].format(position, title[:27], duration_min, user_name),
-                reply_markup=InlineKeyboardMarkup(button),
-            )
-        else:
-            if not forceplay:
-                db[chat_id] = []
+
+        async def join():
             await Sona.join_call(
                 chat_id,
                 original_chat_id,
@@ -172,6 +186,8 @@ async def stream(
                 video=status,
                 image=thumbnail,
             )
+
+        async def enqueue(forceplay=None):
             await put_queue(
                 chat_id,
                 original_chat_id,
@@ -184,6 +200,18 @@ async def stream(
                 "video" if video else "audio",
                 forceplay=forceplay,
             )
+
+        position, entry = await play_or_queue(
+            chat_id, enqueue, join, forceplay=forceplay
+        )
+        if position:
+            button = aq_markup(_, chat_id)
+            await app.send_message(
+                chat_id=original_chat_id,
+                text=_["queue_4"].format(position, title[:27], duration_min, user_name),
+                reply_markup=InlineKeyboardMarkup(button),
+            )
+        else:
             img = await get_thumb(vidid)
             button = stream_markup(_, chat_id)
             run = await app.send_photo(
@@ -197,13 +225,17 @@ async def stream(
                 ),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "stream"
+            entry["mystic"] = run
+            entry["markup"] = "stream"
     elif streamtype == "soundcloud":
         file_path = result["filepath"]
         title = result["title"]
         duration_min = result["duration_min"]
-        if await is_active_chat(chat_id):
+
+        async def join():
+            await Sona.join_call(chat_id, original_chat_id, file_path, video=None)
+
+        async def enqueue(forceplay=None):
             await put_queue(
                 chat_id,
                 original_chat_id,
@@ -214,8 +246,13 @@ async def stream(
                 streamtype,
                 user_id,
                 "audio",
+                forceplay=forceplay,
             )
-            position = len(db.get(chat_id)) - 1
+
+        position, entry = await play_or_queue(
+            chat_id, enqueue, join, forceplay=forceplay
+        )
+        if position:
             button = aq_markup(_, chat_id)
             await app.send_message(
                 chat_id=original_chat_id,
@@ -223,21 +260,6 @@ async def stream(
                 reply_markup=InlineKeyboardMarkup(button),
             )
         else:
-            if not forceplay:
-                db[chat_id] = []
-            await Sona.join_call(chat_id, original_chat_id, file_path, video=None)
-            await put_queue(
-                chat_id,
-                original_chat_id,
-                file_path,
-                title,
-                duration_min,
-                user_name,
-                streamtype,
-                user_id,
-                "audio",
-                forceplay=forceplay,
-            )
             button = stream_markup(_, chat_id)
             run = await app.send_photo(
                 original_chat_id,
@@ -247,15 +269,21 @@ async def stream(
                 ),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "tg"
+            entry["mystic"] = run
+            entry["markup"] = "tg"
     elif streamtype == "telegram":
         file_path = result["path"]
         link = result["link"]
         title = (result["title"]).title()
         duration_min = result["dur"]
         status = True if video else None
-        if await is_active_chat(chat_id):
+
+        async def join():
+            await Sona.join_call(chat_id, original_chat_id, file_path, video=status)
+            if video:
+                await add_active_video_chat(chat_id)
+
+        async def enqueue(forceplay=None):
             await put_queue(
                 chat_id,
                 original_chat_id,
@@ -266,8 +294,13 @@ async def stream(
                 streamtype,
                 user_id,
                 "video" if video else "audio",
+                forceplay=forceplay,
             )
-            position = len(db.get(chat_id)) - 1
+
+        position, entry = await play_or_queue(
+            chat_id, enqueue, join, forceplay=forceplay
+        )
+        if position:
             button = aq_markup(_, chat_id)
             await app.send_message(
                 chat_id=original_chat_id,
@@ -275,23 +308,6 @@ async def stream(
                 reply_markup=InlineKeyboardMarkup(button),
             )
         else:
-            if not forceplay:
-                db[chat_id] = []
-            await Sona.join_call(chat_id, original_chat_id, file_path, video=status)
-            await put_queue(
-                chat_id,
-                original_chat_id,
-                file_path,
-                title,
-                duration_min,
-                user_name,
-                streamtype,
-                user_id,
-                "video" if video else "audio",
-                forceplay=forceplay,
-            )
-            if video:
-                await add_active_video_chat(chat_id)
             button = stream_markup(_, chat_id)
             run = await app.send_photo(
                 original_chat_id,
@@ -299,8 +315,8 @@ async def stream(
                 caption=_["stream_1"].format(link, title[:23], duration_min, user_name),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "tg"
+            entry["mystic"] = run
+            entry["markup"] = "tg"
     elif streamtype == "live":
         link = result["link"]
         vidid = result["vidid"]
@@ -308,31 +324,15 @@ async def stream(
         thumbnail = result["thumb"]
         duration_min = "Live Track"
         status = True if video else None
-        if await is_active_chat(chat_id):
-            await put_queue(
-                chat_id,
-                original_chat_id,
-                f"live_{vidid}",
-                title,
-                duration_min,
-                user_name,
-                vidid,
-                user_id,
-                "video" if video else "audio",
-            )
-            position = len(db.get(chat_id)) - 1
-            button = aq_markup(_, chat_id)
-            await app.send_message(
-                chat_id=original_chat_id,
-                text=_["queue_4"].format(position, title[:27], duration_min, user_name),
-                reply_markup=InlineKeyboardMarkup(button),
-            )
-        else:
-            if not forceplay:
-                db[chat_id] = []
+        file_path = None
+
+        async def fetch():
+            nonlocal file_path
             n, file_path = await YouTube.video(link)
             if n == 0:
                 raise AssistantErr(_["str_3"])
+
+        async def join():
             await Sona.join_call(
                 chat_id,
                 original_chat_id,
@@ -340,6 +340,8 @@ async def stream(
                 video=status,
                 image=thumbnail if thumbnail else None,
             )
+
+        async def enqueue(forceplay=None):
             await put_queue(
                 chat_id,
                 original_chat_id,
@@ -352,6 +354,16 @@ async def stream(
                 "video" if video else "audio",
                 forceplay=forceplay,
             )
+
+        position, entry = await play_or_queue(chat_id, enqueue, join, fetch, forceplay)
+        if position:
+            button = aq_markup(_, chat_id)
+            await app.send_message(
+                chat_id=original_chat_id,
+                text=_["queue_4"].format(position, title[:27], duration_min, user_name),
+                reply_markup=InlineKeyboardMarkup(button),
+            )
+        else:
             img = await get_thumb(vidid)
             button = stream_markup(_, chat_id)
             run = await app.send_photo(
@@ -365,38 +377,22 @@ async def stream(
                 ),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "tg"
+            entry["mystic"] = run
+            entry["markup"] = "tg"
     elif streamtype == "index":
         link = result
         title = "ɪɴᴅᴇx ᴏʀ ᴍ3ᴜ8 ʟɪɴᴋ"
         duration_min = "00:00"
-        if await is_active_chat(chat_id):
-            await put_queue_index(
-                chat_id,
-                original_chat_id,
-                "index_url",
-                title,
-                duration_min,
-                user_name,
-                link,
-                "video" if video else "audio",
-            )
-            position = len(db.get(chat_id)) - 1
-            button = aq_markup(_, chat_id)
-            await mystic.edit_text(
-                text=_["queue_4"].format(position, title[:27], duration_min, user_name),
-                reply_markup=InlineKeyboardMarkup(button),
-            )
-        else:
-            if not forceplay:
-                db[chat_id] = []
+
+        async def join():
             await Sona.join_call(
                 chat_id,
                 original_chat_id,
                 link,
                 video=True if video else None,
             )
+
+        async def enqueue(forceplay=None):
             await put_queue_index(
                 chat_id,
                 original_chat_id,
@@ -408,6 +404,17 @@ async def stream(
                 "video" if video else "audio",
                 forceplay=forceplay,
             )
+
+        position, entry = await play_or_queue(
+            chat_id, enqueue, join, forceplay=forceplay
+        )
+        if position:
+            button = aq_markup(_, chat_id)
+            await mystic.edit_text(
+                text=_["queue_4"].format(position, title[:27], duration_min, user_name),
+                reply_markup=InlineKeyboardMarkup(button),
+            )
+        else:
             button = stream_markup(_, chat_id)
             run = await app.send_photo(
                 original_chat_id,
@@ -415,6 +422,6 @@ async def stream(
                 caption=_["stream_2"].format(user_name),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "tg"
+            entry["mystic"] = run
+            entry["markup"] = "tg"
             await mystic.delete()
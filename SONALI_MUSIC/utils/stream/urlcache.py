@@ -0,0 +1,89 @@
+import asyncio
+import re
+import time
+from collections import OrderedDict
+
+from SONALI_MUSIC.logging import LOGGER
+from SONALI_MUSIC.utils.cache import SingleFlight
+
+EXPIRE = re.compile(r"[?&/]expire[=/](\d+)")
+DEFAULT_TTL = 3600
+SAFETY_MARGIN = 300
+REFRESH_AHEAD = 1800
+MAX_URLS = 1000
+
+
+def url_expiry(url: str) -> float:
+    match = EXPIRE.search(url)
+    if match:
+        return float(match.group(1))
+    return time.time() + DEFAULT_TTL
+
+
+class StreamURLCache:
+    """Resolved googlevideo URLs, served until shortly before they expire.
+
+    A URL within REFRESH_AHEAD seconds of its expire= time is still served
+    while a fresh one is resolved in the background. Concurrent lookups of
+    the same key share one resolve.
+    """
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.inflight = SingleFlight(on_error=self._failed)
+        self.hits = 0
+        self.misses = 0
+        self.refreshed = 0
+        self.discarded = 0
+
+    def _load(self, key, resolve):
+        return self.inflight.start(key, lambda: self._resolve(key, resolve))[0]
+
+    async def _resolve(self, key, resolve):
+        url = await resolve()
+        if self.inflight.owns(key):
+            self.entries[key] = (url, url_expiry(url))
+            self.entries.move_to_end(key)
+            while len(self.entries) > MAX_URLS:
+                self.entries.popitem(last=False)
+        return url
+
+    def _failed(self, key, error):
+        LOGGER(__name__).warning(f"Could not refresh stream URL for {key[0]}: {error}")
+
+    async def get(self, key, resolve):
+        entry = self.entries.get(key)
+        now = time.time()
+        if entry and entry[1] - SAFETY_MARGIN > now:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            if entry[1] - now < REFRESH_AHEAD and key not in self.inflight:
+                self.refreshed += 1
+                self._load(key, resolve)
+            return entry[0]
+        self.misses += 1
+        self.entries.pop(key, None)
+        return await asyncio.shield(self._load(key, resolve))
+
+    def discard(self, url: str, error=None):
+        """Forget a URL the stream could not be started from (typically a 403)."""
+        for key, entry in list(self.entries.items()):
+            if entry[0] == url:
+                del self.entries[key]
+                self.inflight.pop(key, None)
+                self.discarded += 1
+                LOGGER(__name__).info(f"Dropped stream URL for {key[0]}: {error}")
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "urls": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "ratio": round(self.hits / total * 100, 1) if total else 0.0,
+            "refreshed": self.refreshed,
+            "discarded": self.discarded,
+        }
+
+
+urls = StreamURLCache()
@@ -1,7 +1,7 @@
 import os, re, random, aiofiles, aiohttp, math
 from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageFont
-from youtubesearchpython.__future__ import VideosSearch
 from SONALI_MUSIC import app
+from SONALI_MUSIC.utils.metadata import video_info
 from config import YOUTUBE_IMG_URL
 
 arial = ImageFont.truetype("SONALI_MUSIC/assets/assets/font2.ttf", 30)
@@ -52,10 +52,7 @@ async def get_thumb(videoid):
         return f"cache/{videoid}_v4.png"
     url = f"https://www.youtube.com/watch?v={videoid}"
     try:
-        results = await VideosSearch(url, limit=1).next()
-        if not results or not results.get("result"):
-            return YOUTUBE_IMG_URL
-        result = results["result"][0]
+        result = await video_info(url)
     except Exception as e:
         print(f"Error fetching YouTube results: {e}")
         return YOUTUBE_IMG_URL
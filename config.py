@@ -1,5 +1,5 @@
 import re
-from os import getenv
+from os import environ, getenv
 from dotenv import load_dotenv
 from pyrogram import filters
 
@@ -14,6 +14,10 @@ BOT_USERNAME = getenv("BOT_USERNAME" , "raddhika_robot")
 BOT_NAME = getenv("BOT_NAME" , "radhika ꭙ мᴜsɪᴄ")
 ASSUSERNAME = getenv("ASSUSERNAME" , "suraj")
 MONGO_DB_URI = getenv("MONGO_DB_URI", None)
+MONGO_POOL_SIZE = int(getenv("MONGO_POOL_SIZE", 50))
+MONGO_COMPRESSORS = getenv("MONGO_COMPRESSORS", "zlib")
+MONGO_TIMEOUT = int(getenv("MONGO_TIMEOUT", 10000))
+MONGO_READ_PREFERENCE = getenv("MONGO_READ_PREFERENCE", "primaryPreferred")
 DURATION_LIMIT_MIN = int(getenv("DURATION_LIMIT", 17000))
 LOGGER_ID = int(getenv("LOGGER_ID", -1002561713988))
 OWNER_ID = int(getenv("OWNER_ID", 6135117014))
@@ -39,21 +43,22 @@ SONG_DOWNLOAD_DURATION_LIMIT = int(getenv("SONG_DOWNLOAD_DURATION_LIMIT", "99999
 SPOTIFY_CLIENT_ID = getenv("SPOTIFY_CLIENT_ID", "1c21247d714244ddbb09925dac565aed")
 SPOTIFY_CLIENT_SECRET = getenv("SPOTIFY_CLIENT_SECRET", "709e1a2969664491b58200860623ef19")
 PLAYLIST_FETCH_LIMIT = int(getenv("PLAYLIST_FETCH_LIMIT", 25))
+SPEED_CACHE_LIMIT = int(getenv("SPEED_CACHE_LIMIT", 512))
+MEDIA_CACHE_LIMIT = int(getenv("MEDIA_CACHE_LIMIT", 2048))
+CALLS_PER_CORE = int(getenv("CALLS_PER_CORE", 4))
+YTDLP_WORKERS = int(getenv("YTDLP_WORKERS", 4))
 TG_AUDIO_FILESIZE_LIMIT = int(getenv("TG_AUDIO_FILESIZE_LIMIT", "5242880000"))
 TG_VIDEO_FILESIZE_LIMIT = int(getenv("TG_VIDEO_FILESIZE_LIMIT", "5242880000"))
-STRING1 = getenv("STRING_SESSION", None)
-STRING2 = getenv("STRING_SESSION2", None)
-STRING3 = getenv("STRING_SESSION3", None)
-STRING4 = getenv("STRING_SESSION4", None)
-STRING5 = getenv("STRING_SESSION5", None)
-STRING6 = getenv("STRING_SESSION6", None)
-STRING7 = getenv("STRING_SESSION7", None)
+# Every STRING_SESSION, STRING_SESSION2, STRING_SESSION3, ... that is set,
+# keyed by assistant number.
+STRING_SESSIONS = {
+    int(key[len("STRING_SESSION"):] or 1): value
+    for key, value in environ.items()
+    if re.fullmatch(r"STRING_SESSION\d*", key) and value
+}
 BANNED_USERS = filters.user()
-adminlist = {}
 lyrical = {}
-votemode = {}
 autoclean = []
-confirmer = {}
 START_IMG_URL = getenv("START_IMG_URL", "https://files.catbox.moe/hae7d5.jpg")
 PING_IMG_URL = getenv("PING_IMG_URL", "https://files.catbox.moe/hae7d5.jpg")
 PLAYLIST_IMG_URL = "https://files.catbox.moe/mhia7u.jpg"